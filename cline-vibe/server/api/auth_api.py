@@ -1,14 +1,16 @@
 """Authentication business logic."""
 from datetime import timedelta
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, insert
 from sqlalchemy.orm import Session
-from core.security import verify_password, get_password_hash, create_access_token
+from core.security import verify_and_update_password, get_password_hash, create_access_token
 from core.config import settings
 from db_models.user_orm import User
 from models.auth import LoginRequest, Token, UserCreate, UserResponse
 
 
-def register_user(user_data: UserCreate, db: Session) -> UserResponse:
+async def register_user(user_data: UserCreate, db: Session) -> UserResponse:
     """
     Register a new user.
     
@@ -23,27 +25,27 @@ def register_user(user_data: UserCreate, db: Session) -> UserResponse:
         HTTPException: If username already exists
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
-    if existing_user:
+    if db.query(exists().where(User.username == user_data.username)).scalar():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    new_user = User(
-        username=user_data.username,
-        password_hash=hashed_password
-    )
-    db.add(new_user)
+    # Create new user. Hashing is deliberately slow, so keep it off the event loop.
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
+    new_user = db.execute(
+        insert(User)
+        .values(username=user_data.username, password_hash=hashed_password)
+        .returning(User)
+    ).scalar_one()
+    # Build the response before commit, which would expire the instance
+    response = UserResponse.model_validate(new_user)
     db.commit()
-    db.refresh(new_user)
     
-    return new_user
+    return response
 
 
-def authenticate_user(credentials: LoginRequest, db: Session) -> Token:
+async def authenticate_user(credentials: LoginRequest, db: Session) -> Token:
     """
     Authenticate user and generate access token.
     
@@ -57,9 +59,20 @@ def authenticate_user(credentials: LoginRequest, db: Session) -> Token:
     Raises:
         HTTPException: If credentials are invalid or user is inactive
     """
-    user = db.query(User).filter(User.username == credentials.username).first()
+    # Only read columns carried by ix_users_username (index-only scan)
+    user = (
+        db.query(User.username, User.password_hash, User.is_active)
+        .filter(User.username == credentials.username)
+        .first()
+    )
+    
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await run_in_threadpool(
+            verify_and_update_password, credentials.password, user.password_hash
+        )
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -72,6 +85,13 @@ def authenticate_user(credentials: LoginRequest, db: Session) -> Token:
             detail="User is inactive"
         )
     
+    # Upgrade outdated hashes (e.g. bcrypt -> argon2id) now that we know the password
+    if new_hash:
+        db.query(User).filter(User.username == user.username).update(
+            {User.password_hash: new_hash}, synchronize_session=False
+        )
+        db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username},
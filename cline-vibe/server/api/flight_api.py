@@ -1,13 +1,17 @@
-# Class implementation for flights api
-from dataclasses import dataclass
-from typing import Any, Dict, List
+# Implementation for flights api
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List
 import uuid
 
+import orjson
+
 from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
-from core.database import SessionLocal
 from db_models.flight_orm import Flight as FlightORM
 from db_models.rocket_orm import Rocket as RocketORM
 from db_models.enums import RocketState
@@ -15,68 +19,101 @@ from models.rocket import Flight, UpdateFlight
 from api.rocket_statemachine import RocketLaunchService
 
 
-@dataclass()
-class FlightAPI:
-    """Business logic for querying and mutating flight history."""
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> uuid.UUID:
+    """Parse a UUID string; pollers send the same few ids over and over."""
+    return uuid.UUID(value)
+
+
+# Column names of the flights table; ORM attribute names match them 1:1.
+_FLIGHT_COLUMNS = tuple(column.name for column in FlightORM.__table__.columns)
+# Foreign-key fields that arrive as strings and must be coerced to UUID.
+_UUID_FIELDS = frozenset({"rocket_id", "user_id"})
+# Validates a whole result set in one call instead of once per row.
+_FLIGHT_LIST_ADAPTER = TypeAdapter(List[Flight])
+
+
+def _serialize(db_flight: FlightORM) -> Flight:
+    """Convert ORM object to Pydantic response."""
+    return Flight.model_validate(db_flight)
+
+
+def _coerce_uuid(value: Any, field_name: str) -> uuid.UUID:
+    """Convert incoming identifier to UUID, raising a 400 if invalid."""
+    try:
+        return value if isinstance(value, uuid.UUID) else _parse_uuid(str(value))
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {field_name}",
+        ) from exc
+
+
+def _filter_by_rocket(stmt, rocket_id: str | None):
+    """Apply the optional rocket filter and newest-first ordering."""
+    if rocket_id:
+        stmt = stmt.where(FlightORM.rocket_id == _coerce_uuid(rocket_id, "rocket_id"))
+    return stmt.order_by(FlightORM.created_at.desc())
+
+
+def get_flights(rocket_id: str | None, db: Session) -> List[Flight]:
+    """Return all flights or the subset for a given rocket."""
+    try:
+        stmt = _filter_by_rocket(select(FlightORM), rocket_id)
 
-    def _get_session(self) -> Session:
-        """Return a new DB session."""
-        return SessionLocal()
+        # Stream rows in batches instead of materializing the whole table at once
+        flights = db.execute(stmt.execution_options(yield_per=500)).scalars()
+        return _FLIGHT_LIST_ADAPTER.validate_python(flights, from_attributes=True)
+    except SQLAlchemyError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to fetch flights",
+        ) from exc
 
-    def _serialize(self, db_flight: FlightORM) -> Flight:
-        """Convert ORM object to Pydantic response."""
-        return Flight.model_validate(db_flight)
 
-    def _coerce_uuid(self, value: Any, field_name: str) -> uuid.UUID:
-        """Convert incoming identifier to UUID, raising a 400 if invalid."""
-        try:
-            return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
-        except (TypeError, ValueError) as exc:
+def stream_flights(rocket_id: str | None, db: Session) -> StreamingResponse:
+    """Stream flights as a JSON array, encoding rows as they come off the cursor."""
+    # Build the statement up front so a bad rocket_id is still a 400, not a broken stream
+    stmt = _filter_by_rocket(select(*FlightORM.__table__.columns), rocket_id)
+
+    def generate() -> Iterator[bytes]:
+        rows = db.execute(stmt.execution_options(yield_per=500)).mappings()
+        separator = b"["
+        for row in rows:
+            yield separator + orjson.dumps(dict(row), option=orjson.OPT_NAIVE_UTC)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+def create_flight(flight_data: UpdateFlight, db: Session) -> Flight:
+    """Create a new flight. Rocket must be in READY state."""
+    try:
+        # Check that the rocket exists and is in READY state.
+        # Only the state column is needed; no row means no rocket.
+        rocket_state = (
+            db.query(RocketORM.state).filter(RocketORM.id == flight_data.rocket_id).scalar()
+            if flight_data.rocket_id
+            else None
+        )
+        if rocket_state is None:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid {field_name}",
-            ) from exc
-
-    def get_flights(self, rocket_id: str | None) -> List[Flight]:
-        """Return all flights or the subset for a given rocket."""
-        session = self._get_session()
-        try:
-            query = session.query(FlightORM).order_by(FlightORM.created_at.desc())
-            if rocket_id:
-                rocket_uuid = self._coerce_uuid(rocket_id, "rocket_id")
-                query = query.filter(FlightORM.rocket_id == rocket_uuid)
-
-            flights = query.all()
-            return [self._serialize(flight) for flight in flights]
-        except SQLAlchemyError as exc:
-            session.rollback()
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rocket not found",
+            )
+        
+        if rocket_state != RocketState.LANDED:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unable to fetch flights",
-            ) from exc
-        finally:
-            session.close()
-
-    def create_flight(self, flight_data: UpdateFlight) -> Flight:
-        """Create a new flight. Rocket must be in READY state."""
-        session = self._get_session()
-        try:
-            # Check that the rocket exists and is in READY state
-            rocket = session.query(RocketORM).filter(RocketORM.id == flight_data.rocket_id).first()
-            if not rocket:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Rocket not found",
-                )
-            
-            if rocket.state != RocketState.LANDED:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Rocket must be in READY state to create a flight. Current state: {rocket.state.value}",
-                )
-
-            # Create the flight
-            flight = FlightORM(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Rocket must be in READY state to create a flight. Current state: {rocket_state.value}",
+            )
+
+        # Create the flight; RETURNING hands back the new row without a refresh SELECT
+        flight = db.execute(
+            insert(FlightORM)
+            .values(
                 rocket_id=flight_data.rocket_id,
                 state=RocketState.PREPARING,
                 source=flight_data.source,
@@ -88,130 +125,135 @@ class FlightAPI:
                 user_id=flight_data.user_id,
                 message=flight_data.message,
             )
-            session.add(flight)
-            session.commit()
-            session.refresh(flight)
-
-            return self._serialize(flight)
-        except HTTPException:
-            session.rollback()
-            raise
-        except IntegrityError as exc:
-            session.rollback()
+            .returning(FlightORM)
+        ).scalar_one()
+
+        # Serialize before commit; committing expires the instance
+        response = _serialize(flight)
+        db.commit()
+        return response
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unable to create flight due to database constraint violation",
+        ) from exc
+    except SQLAlchemyError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to create flight",
+        ) from exc
+
+
+def trigger_flight(flight: UpdateFlight, db: Session) -> Flight:
+    """Trigger a flight launch. Rocket must be in LANDED state."""
+    try:
+        # Get flight ID from the update payload
+        flight_id = getattr(flight, "id", None) or getattr(flight, "flight_id", None)
+        if not flight_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unable to create flight due to database constraint violation",
-            ) from exc
-        except SQLAlchemyError as exc:
-            session.rollback()
+                detail="Flight id is required",
+            )
+
+        flight_uuid = _coerce_uuid(flight_id, "flight_id")
+        # Load the flight and its rocket in a single round-trip
+        db_flight = (
+            db.query(FlightORM)
+            .options(joinedload(FlightORM.rocket))
+            .filter(FlightORM.id == flight_uuid)
+            .first()
+        )
+
+        if not db_flight:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unable to create flight",
-            ) from exc
-        finally:
-            session.close()
-
-    def trigger_flight(self, flight: UpdateFlight) -> Flight:
-        """Trigger a flight launch. Rocket must be in LANDED state."""
-        session = self._get_session()
-        try:
-            # Get flight ID from the update payload
-            flight_id = getattr(flight, "id", None) or getattr(flight, "flight_id", None)
-            if not flight_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Flight id is required",
-                )
-
-            flight_uuid = self._coerce_uuid(flight_id, "flight_id")
-            db_flight = session.query(FlightORM).filter(FlightORM.id == flight_uuid).first()
-
-            if not db_flight:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Flight not found",
-                )
-
-            # Get the rocket associated with this flight
-            rocket = session.query(RocketORM).filter(RocketORM.id == db_flight.rocket_id).first()
-            if not rocket:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Rocket not found for this flight",
-                )
-
-            # Check that rocket is in LANDED state
-            if rocket.state != RocketState.LANDED:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Rocket must be in LANDED state to trigger a flight. Current state: {rocket.state.value}",
-                )
-
-            # Start the launch process (handled in separate service)
-            RocketLaunchService.start_launch(db_flight, rocket, session)
-            
-            session.refresh(db_flight)
-            return self._serialize(db_flight)
-        except HTTPException:
-            session.rollback()
-            raise
-        except SQLAlchemyError as exc:
-            session.rollback()
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Flight not found",
+            )
+
+        rocket = db_flight.rocket
+        if not rocket:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unable to trigger flight",
-            ) from exc
-        finally:
-            session.close()
-
-
-    def update_flight(self, flight: UpdateFlight) -> Flight:
-        """Apply partial updates to a flight row."""
-        session = self._get_session()
-        try:
-            flight_id = getattr(flight, "id", None) or getattr(flight, "flight_id", None)
-            if not flight_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Flight id is required",
-                )
-
-            flight_uuid = self._coerce_uuid(flight_id, "flight_id")
-            db_flight = session.query(FlightORM).filter(FlightORM.id == flight_uuid).first()
-
-            if not db_flight:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Flight not found",
-                )
-
-            update_payload: Dict[str, Any]
-            if hasattr(flight, "model_dump"):
-                update_payload = flight.model_dump(exclude_none=True, exclude_unset=True)
-            else:
-                update_payload = {k: v for k, v in vars(flight).items() if v is not None}
-
-            # Remove identifier keys so we don't overwrite PK
-            update_payload.pop("id", None)
-            update_payload.pop("flight_id", None)
-
-            for field_name, value in update_payload.items():
-                if field_name in {"rocket_id", "user_id"}:
-                    value = self._coerce_uuid(value, field_name)
-                setattr(db_flight, field_name, value)
-
-            session.commit()
-            session.refresh(db_flight)
-
-            return self._serialize(db_flight)
-        except SQLAlchemyError as exc:
-            session.rollback()
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rocket not found for this flight",
+            )
+
+        # Check that rocket is in LANDED state
+        if rocket.state != RocketState.LANDED:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Unable to update flight",
-            ) from exc
-        finally:
-            session.close()
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Rocket must be in LANDED state to trigger a flight. Current state: {rocket.state.value}",
+            )
+
+        # Start the launch process (handled in separate service)
+        RocketLaunchService.start_launch(db_flight, rocket, db)
+        
+        db.refresh(db_flight)
+        return _serialize(db_flight)
+    except HTTPException:
+        db.rollback()
+        raise
+    except SQLAlchemyError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to trigger flight",
+        ) from exc
 
 
-flight_api = FlightAPI()
\ No newline at end of file
+def update_flight(flight: UpdateFlight, db: Session) -> Flight:
+    """Apply partial updates to a flight row."""
+    try:
+        flight_id = getattr(flight, "id", None) or getattr(flight, "flight_id", None)
+        if not flight_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Flight id is required",
+            )
+
+        flight_uuid = _coerce_uuid(flight_id, "flight_id")
+
+        update_payload: Dict[str, Any]
+        if hasattr(flight, "model_dump"):
+            update_payload = flight.model_dump(exclude_none=True, exclude_unset=True)
+        else:
+            update_payload = {k: v for k, v in vars(flight).items() if v is not None}
+
+        # Remove identifier keys so we don't overwrite PK
+        update_payload.pop("id", None)
+        update_payload.pop("flight_id", None)
+
+        values: Dict[str, Any] = {}
+        for field_name, value in update_payload.items():
+            if field_name not in _FLIGHT_COLUMNS:
+                continue
+            if field_name in _UUID_FIELDS:
+                value = _coerce_uuid(value, field_name)
+            values[field_name] = value
+
+        # A single UPDATE ... RETURNING replaces SELECT + UPDATE + refresh SELECT
+        row = db.execute(
+            update(FlightORM)
+            .where(FlightORM.id == flight_uuid)
+            .values(**values)
+            .returning(*FlightORM.__table__.columns)
+        ).mappings().first()
+
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Flight not found",
+            )
+
+        db.commit()
+        return Flight.model_construct(**row)
+    except SQLAlchemyError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Unable to update flight",
+        ) from exc
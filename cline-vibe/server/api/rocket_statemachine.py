@@ -1,31 +1,82 @@
 """Rocket state machine and launch logic."""
+import asyncio
 import threading
 import time
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import Update, bindparam, text, update
+from sqlalchemy.orm import Session
 from db_models.rocket_orm import Rocket as RocketORM
 from db_models.flight_orm import Flight as FlightORM
 from db_models.enums import RocketState, JobStatus
 from core.config import settings
+from core.database import SessionLocal
+
+
+# Transition writes are prepared once at import and only re-bound per call.
+# They target rows by primary key, so there is no read-modify-write SELECT
+# and no ORM identity-map or flush work in the worker.
+_UPD_ROCKET_STATE = (
+    update(RocketORM)
+    .where(RocketORM.id == bindparam("b_id"))
+    .values(state=bindparam("b_state"))
+    .execution_options(synchronize_session=False)
+)
+_UPD_FLIGHT_STATE = (
+    update(FlightORM)
+    .where(FlightORM.id == bindparam("b_id"))
+    .values(state=bindparam("b_state"))
+    .execution_options(synchronize_session=False)
+)
+_UPD_FLIGHT_PROGRESS = (
+    update(FlightORM)
+    .where(FlightORM.id == bindparam("b_id"))
+    .values(
+        state=bindparam("b_state"),
+        status=bindparam("b_status"),
+        location=bindparam("b_location"),
+    )
+    .execution_options(synchronize_session=False)
+)
+# Intermediate states are rewritten by the next transition, so losing the
+# last one on a server crash is harmless; skip waiting for the WAL flush.
+_SYNC_COMMIT_OFF = text("SET LOCAL synchronous_commit = OFF")
 
 
 class RocketProcessManager:
-    """Manages background threads for rocket state transitions."""
+    """Manages background tasks for rocket state transitions.
+    
+    Every flight runs as an asyncio task on a single event loop owned by the
+    manager, so concurrent flights cost a coroutine each rather than an OS
+    thread each.
+    """
+    
+    __slots__ = (
+        '_lock',
+        '_processes',
+        '_process_stop_flags',
+        'operation_duration',
+        'SessionLocal',
+        '_loop',
+        '_loop_thread',
+    )
     
-    _instance = None
-    _lock = threading.Lock()
+    # State progression timing: (start as fraction of total operation, state),
+    # in order. Each state lasts until the next one starts.
+    _STATE_TIMINGS = (
+        (0.0, RocketState.PREPARING),   # 0-20% of operation
+        (0.2, RocketState.READY),       # 20-25% of operation
+        (0.25, RocketState.IN_FLIGHT),  # 25-90% of operation
+        (0.9, RocketState.LANDED),      # 90-100% of operation
+    )
     
-    def __new__(cls):
-        """Singleton pattern to ensure one manager instance."""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
+    # Flight status set on entering a state; other states leave status as is
+    _STATUS_FOR = {
+        RocketState.IN_FLIGHT: JobStatus.RUNNING,
+        RocketState.LANDED: JobStatus.SUCCEEDED,
+    }
     
     def __init__(self, operation_duration_seconds: int = 30):
         """Initialize the rocket process manager.
@@ -33,208 +84,208 @@ class RocketProcessManager:
         Args:
             operation_duration_seconds: Total duration for a rocket flight (default: 30 seconds)
         """
-        if hasattr(self, '_initialized') and self._initialized:
-            return
-        
-        self._processes: Dict[str, threading.Thread] = {}
-        self._process_stop_flags: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._processes: Dict[uuid.UUID, Future] = {}
+        self._process_stop_flags: Dict[uuid.UUID, asyncio.Event] = {}
         self.operation_duration = timedelta(seconds=operation_duration_seconds)
         
-        # State progression timing (as percentage of total operation)
-        self._state_timings = {
-            RocketState.PREPARING: (0.0, 0.2),      # 0-20% of operation
-            RocketState.READY: (0.2, 0.25),         # 20-25% of operation
-            RocketState.IN_FLIGHT: (0.25, 0.9),     # 25-90% of operation
-            RocketState.LANDED: (0.9, 1.0),         # 90-100% of operation
-        }
+        # Background writes share the application's engine and connection pool
+        self.SessionLocal = SessionLocal
         
-        # Create a separate engine for background threads
-        self.engine = create_engine(
-            settings.DATABASE_URL,
-            pool_pre_ping=True,
-            echo=False
+        # Event loop that runs all flight tasks. Callers may be sync code or
+        # another loop, so tasks are handed over with run_coroutine_threadsafe.
+        self._loop = asyncio.new_event_loop()
+        # Blocking DB writes run on a bounded pool, sized below the engine's
+        # connection pool so flights can't starve request handlers
+        self._loop.set_default_executor(ThreadPoolExecutor(
+            max_workers=settings.FLIGHT_WORKER_THREADS,
+            thread_name_prefix="rocket-db"
+        ))
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="rocket-process-loop",
+            daemon=True
         )
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        self._initialized = True
+        self._loop_thread.start()
     
     def _get_db_session(self) -> Session:
-        """Get a database session for the background thread."""
+        """Get a database session for a background write."""
         return self.SessionLocal()
     
-    def _rocket_state_transition_worker(
+    def _build_plan(
+        self,
+        flight_id: uuid.UUID,
+        rocket_id: uuid.UUID,
+        source: str,
+        destination: str,
+        start_time: float,
+        duration_seconds: float
+    ) -> List[Tuple[float, bool, Update, Dict[str, Any], Dict[str, Any]]]:
+        """Precompute every write a flight will make.
+        
+        Returns (monotonic time, async commit, flight statement, flight
+        params, rocket params) per transition, so the worker only waits and
+        executes. The table's first state (PREPARING at 0%) was already
+        committed by start_launch, so only the later ones are planned.
+        """
+        plan = []
+        for start_pct, state in self._STATE_TIMINGS[1:]:
+            status = self._STATUS_FOR.get(state)
+            if status is None:
+                flight_stmt = _UPD_FLIGHT_STATE
+                flight_params = {"b_id": flight_id, "b_state": state}
+            else:
+                flight_stmt = _UPD_FLIGHT_PROGRESS
+                flight_params = {
+                    "b_id": flight_id,
+                    "b_state": state,
+                    "b_status": status,
+                    # Could be more sophisticated than source while in flight
+                    "b_location": destination if state == RocketState.LANDED else source,
+                }
+            plan.append((
+                start_time + duration_seconds * start_pct,
+                state != RocketState.LANDED,
+                flight_stmt,
+                flight_params,
+                {"b_id": rocket_id, "b_state": state},
+            ))
+        return plan
+    
+    def _apply_state(
+        self,
+        db: Session,
+        async_commit: bool,
+        flight_stmt: Update,
+        flight_params: Dict[str, Any],
+        rocket_params: Dict[str, Any]
+    ) -> None:
+        """Write a state transition to the flight and its rocket in one transaction."""
+        try:
+            with db.begin():
+                if async_commit:
+                    db.execute(_SYNC_COMMIT_OFF)
+                db.execute(_UPD_ROCKET_STATE, rocket_params)
+                db.execute(flight_stmt, flight_params)
+        except Exception as e:
+            print(f"Error updating state for flight {flight_params['b_id']}: {e}")
+    
+    async def _rocket_state_transition_worker(
         self,
-        flight_id: str,
-        rocket_id: str,
+        flight_id: uuid.UUID,
+        rocket_id: uuid.UUID,
         source: str,
         destination: str,
         estimated_time: int,
-        stop_event: threading.Event
+        stop_event: asyncio.Event
     ):
         """Background worker that transitions rocket and flight states.
         
+        The whole schedule is planned up front and the worker sleeps on the
+        stop event until each transition, so it wakes once per state change and
+        exits as soon as it is stopped. Database writes are blocking, so they
+        run in the loop's executor.
+        
         Args:
-            flight_id: The flight UUID as string
-            rocket_id: The rocket UUID as string
+            flight_id: The flight UUID
+            rocket_id: The rocket UUID
             source: Flight origin
             destination: Flight destination
             estimated_time: Estimated flight time in seconds
             stop_event: Event to signal when to stop the process
         """
-        start_time = datetime.utcnow()
+        # Monotonic clock: cheap floats, and immune to wall-clock adjustments
+        start_time = time.monotonic()
         # Use the flight's estimated_time if provided, otherwise use default
         duration_seconds = estimated_time if estimated_time > 0 else self.operation_duration.total_seconds()
-        end_time = start_time + timedelta(seconds=duration_seconds)
         
-        # Update interval (every second)
-        update_interval = 1.0
-        last_state = None
+        plan = self._build_plan(
+            flight_id, rocket_id, source, destination, start_time, duration_seconds
+        )
         
-        while not stop_event.is_set():
-            now = datetime.utcnow()
-            
-            # Check if we've exceeded the end time
-            if now >= end_time:
-                # Final state: LANDED
-                db = self._get_db_session()
-                try:
-                    flight = db.query(FlightORM).filter(FlightORM.id == uuid.UUID(flight_id)).first()
-                    rocket = db.query(RocketORM).filter(RocketORM.id == uuid.UUID(rocket_id)).first()
-                    
-                    if flight and rocket:
-                        if rocket.state != RocketState.LANDED:
-                            rocket.state = RocketState.LANDED
-                            flight.state = RocketState.LANDED
-                            flight.status = JobStatus.SUCCEEDED
-                            flight.location = destination
-                            db.commit()
-                    
-                    db.close()
-                    break
-                except Exception as e:
-                    print(f"Error updating final state for flight {flight_id}: {e}")
-                    db.rollback()
-                    db.close()
-                    break
-            
-            # Calculate progress (0.0 to 1.0)
-            elapsed = (now - start_time).total_seconds()
-            progress = elapsed / duration_seconds if duration_seconds > 0 else 0.0
-            progress = min(progress, 1.0)
-            
-            # Determine current state based on progress
-            current_state = None
-            for state, (start_pct, end_pct) in self._state_timings.items():
-                if start_pct <= progress < end_pct:
-                    current_state = state
-                    break
-            
-            # If we're at the end, set to LANDED
-            if progress >= 0.9:
-                current_state = RocketState.LANDED
-            
-            # Update database if state changed
-            if current_state and current_state != last_state:
-                db = self._get_db_session()
+        # One session for the worker's lifetime. Writes hop between executor
+        # threads but never overlap, and the pooled connection is only held
+        # inside each transaction.
+        db = self._get_db_session()
+        try:
+            for transition_at, *write in plan:
+                wait_seconds = transition_at - time.monotonic()
                 try:
-                    flight = db.query(FlightORM).filter(FlightORM.id == uuid.UUID(flight_id)).first()
-                    rocket = db.query(RocketORM).filter(RocketORM.id == uuid.UUID(rocket_id)).first()
-                    
-                    if flight and rocket:
-                        rocket.state = current_state
-                        flight.state = current_state
-                        
-                        # Update status based on state
-                        if current_state == RocketState.IN_FLIGHT:
-                            flight.status = JobStatus.RUNNING
-                            # Update location during flight (interpolate between source and destination)
-                            if progress < 0.9:
-                                flight.location = source  # Could be more sophisticated
-                        elif current_state == RocketState.LANDED:
-                            flight.status = JobStatus.SUCCEEDED
-                            flight.location = destination
-                        
-                        db.commit()
-                        last_state = current_state
-                    
-                    db.close()
-                except Exception as e:
-                    print(f"Error updating state for flight {flight_id}: {e}")
-                    db.rollback()
-                    db.close()
-            
-            # Sleep until next update
-            time.sleep(update_interval)
-        
-        # Clean up
-        with self._lock:
-            if flight_id in self._processes:
-                del self._processes[flight_id]
-            if flight_id in self._process_stop_flags:
-                del self._process_stop_flags[flight_id]
+                    await asyncio.wait_for(stop_event.wait(), timeout=max(0.0, wait_seconds))
+                    return
+                except asyncio.TimeoutError:
+                    pass
+                await asyncio.to_thread(self._apply_state, db, *write)
+        finally:
+            db.close()
+            # Clean up, unless a restart has already replaced this flight's entry
+            with self._lock:
+                if self._process_stop_flags.get(flight_id) is stop_event:
+                    del self._process_stop_flags[flight_id]
+                    self._processes.pop(flight_id, None)
     
     def start_rocket_process(
         self,
-        flight_id: str,
-        rocket_id: str,
+        flight_id: uuid.UUID,
+        rocket_id: uuid.UUID,
         source: str,
         destination: str,
         estimated_time: int
     ):
-        """Start a background thread to transition rocket and flight states.
+        """Start a background task to transition rocket and flight states.
         
         Args:
-            flight_id: The flight UUID as string
-            rocket_id: The rocket UUID as string
+            flight_id: The flight UUID
+            rocket_id: The rocket UUID
             source: Flight origin
             destination: Flight destination
             estimated_time: Estimated flight time in seconds
         """
-        # Stop any existing process for this flight
-        if flight_id in self._processes:
-            self.stop_rocket_process(flight_id)
-        
-        # Create stop event
-        stop_event = threading.Event()
+        # One critical section: stop any existing task for this flight, then
+        # schedule and register the new one, so its cleanup cannot run before
+        # the entries exist. The old task is not waited for; it exits on its
+        # next wake-up and leaves the new entries alone.
+        stop_event = asyncio.Event()
         with self._lock:
+            previous = self._process_stop_flags.get(flight_id)
+            if previous is not None:
+                self._loop.call_soon_threadsafe(previous.set)
             self._process_stop_flags[flight_id] = stop_event
-        
-        # Create and start thread
-        thread = threading.Thread(
-            target=self._rocket_state_transition_worker,
-            args=(flight_id, rocket_id, source, destination, estimated_time, stop_event),
-            daemon=True
-        )
-        thread.start()
-        with self._lock:
-            self._processes[flight_id] = thread
+            self._processes[flight_id] = asyncio.run_coroutine_threadsafe(
+                self._rocket_state_transition_worker(
+                    flight_id, rocket_id, source, destination, estimated_time, stop_event
+                ),
+                self._loop
+            )
     
-    def stop_rocket_process(self, flight_id: str):
+    def stop_rocket_process(self, flight_id: uuid.UUID):
         """Stop the background process for a flight.
         
         Args:
-            flight_id: The flight UUID as string
+            flight_id: The flight UUID
         """
         with self._lock:
-            if flight_id in self._process_stop_flags:
-                self._process_stop_flags[flight_id].set()
-            
-            if flight_id in self._processes:
-                thread = self._processes[flight_id]
-                thread.join(timeout=2.0)  # Wait up to 2 seconds for thread to finish
+            stop_event = self._process_stop_flags.get(flight_id)
+            task = self._processes.get(flight_id)
+        
+        if stop_event is not None:
+            # asyncio.Event is not thread-safe; set it from the loop's own thread
+            self._loop.call_soon_threadsafe(stop_event.set)
+        
+        if task is not None:
+            # Wait outside the lock; the task takes it during cleanup
+            try:
+                task.result(timeout=2.0)  # Wait up to 2 seconds for task to finish
+            except Exception:
+                pass
 
 
-# Global singleton instance
-_rocket_process_manager = None
-_manager_lock = threading.Lock()
+# Module-level singleton; the import lock guarantees it is built exactly once
+_rocket_process_manager = RocketProcessManager()
 
 
 def get_rocket_process_manager() -> RocketProcessManager:
     """Get the singleton RocketProcessManager instance."""
-    global _rocket_process_manager
-    if _rocket_process_manager is None:
-        with _manager_lock:
-            if _rocket_process_manager is None:
-                _rocket_process_manager = RocketProcessManager()
     return _rocket_process_manager
 
 
@@ -259,11 +310,11 @@ class RocketLaunchService:
         
         session.commit()
         
-        # Start background thread for state transitions
+        # Start background task for the remaining state transitions
         process_manager = get_rocket_process_manager()
         process_manager.start_rocket_process(
-            flight_id=str(flight.id),
-            rocket_id=str(rocket.id),
+            flight_id=flight.id,
+            rocket_id=rocket.id,
             source=flight.source,
             destination=flight.destination,
             estimated_time=flight.estimated_time
@@ -1,36 +1,50 @@
 """Main FastAPI application."""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from routes import auth_router, rocket_router
 
+from core.config import settings
 from core.database import engine, Base
 from db_models import flight_orm, rocket_orm, user_orm  # ensure tables register
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
+# Create database tables. Opt-in, so regular starts (and every worker
+# process) skip the catalog queries create_all makes.
 RESET_DATABASE = True
-if RESET_DATABASE:
-    """Drop and recreate all tables."""
-    Base.metadata.drop_all(bind=engine)
+if settings.AUTO_CREATE_TABLES:
+    if RESET_DATABASE:
+        """Drop and recreate all tables."""
+        Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks."""
+    yield
+    # Close pooled connections cleanly on shutdown
+    engine.dispose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Vibe Rocket Flight API",
     description="API for managing rocket flight jobs",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PATCH", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Include routers
@@ -40,13 +54,18 @@ app.include_router(rocket_router.rocket_router)
 # app.include_router(websockets.router)
 
 
+# Static bodies are serialized once; probes hit these endpoints constantly
+_ROOT_BODY = b'{"message":"Vibe Rocket Flight API"}'
+_HEALTH_BODY = b'{"status":"healthy"}'
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {"message": "Vibe Rocket Flight API"}
+    return Response(_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
 async def health():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return Response(_HEALTH_BODY, media_type="application/json")
@@ -9,8 +9,23 @@ load_dotenv()
 class Settings:
     """Application settings."""
 
+    # Development mode: enables extra runtime checks such as lazy-load detection
+    DEBUG: bool = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
+
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Create (and, with RESET_DATABASE, recreate) tables at startup
+    AUTO_CREATE_TABLES: bool = os.getenv("AUTO_CREATE_TABLES", "false").lower() in ("1", "true", "yes")
+
+    # Threads available to flight state-transition writes
+    FLIGHT_WORKER_THREADS: int = int(os.getenv("FLIGHT_WORKER_THREADS", "10"))
+
+    # CORS: comma-separated list of allowed browser origins
+    CORS_ORIGINS: list[str] = [
+        origin.strip()
+        for origin in os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
+        if origin.strip()
+    ]
 
     # JWT
     SECRET_KEY: str = os.getenv("SECRET_KEY")
@@ -1,17 +1,31 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import ORMExecuteState, raiseload, sessionmaker
 from .config import settings
 
 engine = create_engine(
     settings.DATABASE_URL,
+    pool_size=20,
+    max_overflow=40,
     pool_pre_ping=True,
+    pool_recycle=1800,  # Recycle connections before server-side idle timeouts
     echo=False  # Set to True for SQL query logging
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+if settings.DEBUG:
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def _raise_on_lazy_load(state: ORMExecuteState) -> None:
+        """Make any relationship lazy load raise, so N+1 patterns fail loudly in dev.
+
+        Relationships that are actually needed must be loaded eagerly with
+        joinedload/selectinload, which take precedence over raiseload.
+        """
+        if state.is_select and not state.is_column_load and not state.is_relationship_load:
+            state.statement = state.statement.options(raiseload("*"))
+
 Base = declarative_base()
 
 def get_db():
@@ -1,9 +1,9 @@
 """Flight ORM model for flight history."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 from core.database import Base
 from db_models.enums import RocketState, JobStatus
 
@@ -14,20 +14,37 @@ class Flight(Base):
     __tablename__ = "flights"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    rocket_id = Column(UUID(as_uuid=True), ForeignKey("rockets.id"), nullable=False, index=True)
-    state = Column(SQLEnum(RocketState), nullable=False)
+    rocket_id = Column(UUID(as_uuid=True), ForeignKey("rockets.id", ondelete="CASCADE"), nullable=False)
+    state = Column(SQLEnum(RocketState, native_enum=False, length=16, create_constraint=True, validate_strings=True), nullable=False)
     source = Column(String, nullable=False)
     destination = Column(String, nullable=False)
     location = Column(String, nullable=True)  # JSON string
     estimated_time = Column(Integer, nullable=False)  # seconds
-    status = Column(SQLEnum(JobStatus), nullable=False)
+    status = Column(SQLEnum(JobStatus, native_enum=False, length=16, create_constraint=True, validate_strings=True), nullable=False)
     process_id = Column(String, nullable=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     message = Column(String, nullable=True)
     
     # Relationships
-    rocket = relationship("Rocket", backref="flights")
+    # Child rows are removed by ON DELETE CASCADE; don't load them on delete
+    rocket = relationship("Rocket", backref=backref("flights", passive_deletes="all"))
     user = relationship("User", backref="flights")
 
+    __table_args__ = (
+        # Serves "flights for a rocket, newest first" without a sort step;
+        # the leading rocket_id column also covers plain rocket_id lookups.
+        Index("ix_flights_rocket_created", rocket_id, created_at.desc()),
+        # Only in-progress flights; stays small however long the history gets.
+        # Enum columns store member names, hence the upper-case literals.
+        Index(
+            "ix_flights_active",
+            rocket_id,
+            status,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+        ),
+        # Per-user flight history; also serves user_id lookups
+        Index("ix_flights_user_created", user_id, created_at),
+    )
+
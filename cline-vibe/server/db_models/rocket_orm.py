@@ -12,6 +12,6 @@ class Rocket(Base):
     __tablename__ = "rockets"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    state = Column(SQLEnum(RocketState), nullable=False, default=RocketState.PREPARING)
+    state = Column(SQLEnum(RocketState, native_enum=False, length=16, create_constraint=True, validate_strings=True), nullable=False, default=RocketState.PREPARING)
     name = Column(String, unique=True, nullable=False, index=True)
 
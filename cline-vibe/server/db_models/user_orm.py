@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
 from core.database import Base
 
@@ -11,7 +11,18 @@ class User(Base):
     __tablename__ = "users"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    username = Column(String, unique=True, nullable=False, index=True)
+    username = Column(String, nullable=False)
     password_hash = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    is_active = Column(Boolean, default=True, nullable=False)
\ No newline at end of file
+    is_active = Column(Boolean, default=True, nullable=False)
+
+    __table_args__ = (
+        # Unique lookup index that also carries the login columns, so
+        # authentication can be answered with an index-only scan.
+        Index(
+            "ix_users_username",
+            "username",
+            unique=True,
+            postgresql_include=["password_hash", "is_active"],
+        ),
+    )
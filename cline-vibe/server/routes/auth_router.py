@@ -11,13 +11,13 @@ router = APIRouter(prefix="/api/v1", tags=["auth"])
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user."""
-    return register_user(user_data, db)
+    return await register_user(user_data, db)
 
 
 @router.post("/login", response_model=Token)
 async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     """Login and get JWT token."""
-    return authenticate_user(credentials, db)
+    return await authenticate_user(credentials, db)
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
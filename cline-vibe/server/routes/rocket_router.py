@@ -1,11 +1,11 @@
 """Rocket endpoints."""
 from typing import Any, List
+import uuid
 from fastapi import APIRouter, Depends, status, Path, Body
 from sqlalchemy.orm import Session
 from core.database import get_db
-from api.flight_api import flight_api
-from api.rocket_api import rocket_api
-from models.rocket import RocketCreate, RocketResponse
+from api import flight_api, rocket_api
+from models.rocket import RocketCreate, RocketResponse, UpdateFlight
 
 rocket_router = APIRouter(prefix="/api/v1/rocket", tags=["rockets"])
 flight_router = APIRouter(prefix="/api/v1/flights", tags=["flights"])
@@ -14,7 +14,7 @@ flight_router = APIRouter(prefix="/api/v1/flights", tags=["flights"])
 @rocket_router.get("", response_model=List[RocketResponse])
 async def get_all_rockets(db: Session = Depends(get_db)):
     """Get all rockets."""
-    return rocket_api.get_rocket(None)
+    return rocket_api.get_rocket(None, db)
 
 
 @rocket_router.get("/{rocket_id}", response_model=RocketResponse)
@@ -23,7 +23,7 @@ async def get_rocket(
     db: Session = Depends(get_db)
 ):
     """Get rocket by ID."""
-    return rocket_api.get_rocket(rocket_id)
+    return rocket_api.get_rocket(rocket_id, db)
 
 
 @rocket_router.post("", response_model=RocketResponse, status_code=status.HTTP_201_CREATED)
@@ -32,7 +32,7 @@ async def create_rocket(
     db: Session = Depends(get_db)
 ):
     """Create a new rocket."""
-    return rocket_api.create_rocket(rocket_data.name)
+    return rocket_api.create_rocket(rocket_data.name, db)
 
 
 @rocket_router.delete("/{rocket_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -41,14 +41,14 @@ async def delete_rocket(
     db: Session = Depends(get_db)
 ):
     """Delete rocket and all associated flights in flights table."""
-    rocket_api.delete_rocket(rocket_id)
+    rocket_api.delete_rocket(rocket_id, db)
     return None
 
 
 @flight_router.get("")
 async def get_all_flights(db: Session = Depends(get_db)):
     """Get all flights in flights table."""
-    return flight_api.get_flights(None)
+    return flight_api.stream_flights(None, db)
 
 
 @flight_router.get("/{rocket_id}")
@@ -57,33 +57,24 @@ async def get_flights(
     db: Session = Depends(get_db)
 ):
     """Get flights by rocket_id."""
-    return flight_api.get_flights(rocket_id)
+    return flight_api.stream_flights(rocket_id, db)
 
 @flight_router.post("/trigger/{flight_id}")
 async def trigger_flight(
-    flight_id: str = Path(..., description="Flight ID to trigger"),
+    flight_id: uuid.UUID = Path(..., description="Flight ID to trigger"),
     db: Session = Depends(get_db)
 ):
     """Trigger (start) the flight for the specified flight_id."""
-    return flight_api.trigger_flight(flight_id)
+    return flight_api.trigger_flight(UpdateFlight.model_validate({"id": flight_id}), db)
 
 
 @flight_router.patch("/{flight_id}")
 async def update_flight(
-    flight_id: str = Path(..., description="Flight ID to update"),
-    flight_data: dict = Body(..., description="Flight update data"),
+    flight_id: uuid.UUID = Path(..., description="Flight ID to update"),
+    flight_data: UpdateFlight = Body(..., description="Flight update data"),
     db: Session = Depends(get_db)
 ):
     """Update the flight info."""
-    # Add flight_id to flight_data if not present
-    if "id" not in flight_data and "flight_id" not in flight_data:
-        flight_data["flight_id"] = flight_id
-    
-    # Convert dict to object-like structure for flight_api
-    class UpdateFlight:
-        def __init__(self, data: dict):
-            for key, value in data.items():
-                setattr(self, key, value)
-    
-    flight = UpdateFlight(flight_data)
-    return flight_api.update_flight(flight)
+    # The path identifies the flight; the body is already validated by FastAPI
+    flight_data.id = flight_id
+    return flight_api.update_flight(flight_data, db)
@@ -7,8 +7,7 @@ from pathlib import Path
 # cline_vibe_server = project_root / "cline-vibe" / "server"
 # sys.path.insert(0, str(cline_vibe_server))
 
-from api.rocket_api import rocket_api
-from api.flight_api import flight_api
+from api import flight_api, rocket_api
 from models.rocket import UpdateFlight
 from db_models.enums import RocketState, JobStatus
 from db_models.rocket_orm import Rocket as RocketORM
@@ -16,6 +15,15 @@ from core.database import SessionLocal
 import uuid
 
 
+def _call(api_fn, *args):
+    """Run an API call with its own short-lived session, as a request would."""
+    session = SessionLocal()
+    try:
+        return api_fn(*args, session)
+    finally:
+        session.close()
+
+
 def integration_test():
     """Run a quick integration test to make sure all apis are up and running"""
     print("=" * 60)
@@ -25,7 +33,7 @@ def integration_test():
     # 1. Create a new rocket
     print("\n1. Creating a new rocket...")
     rocket_name = f"TestRocket_{uuid.uuid4().hex[:8]}"
-    rocket = rocket_api.create_rocket(rocket_name)
+    rocket = _call(rocket_api.create_rocket, rocket_name)
     print(f"   ✓ Rocket created: {rocket.name} (ID: {rocket.id}, State: {rocket.state.value})")
     
     # Verify rocket is in PREPARING state
@@ -61,7 +69,7 @@ def integration_test():
         message="Integration test flight"
     )
     
-    flight = flight_api.create_flight(flight_data)
+    flight = _call(flight_api.create_flight, flight_data)
     print(f"   ✓ Flight created: {flight.id} (State: {flight.state.value})")
     assert flight.rocket_id == rocket.id
     assert flight.state == RocketState.PREPARING
@@ -79,7 +87,7 @@ def integration_test():
         session.close()
     
     update_flight = UpdateFlight(id=flight.id)
-    triggered_flight = flight_api.trigger_flight(update_flight)
+    triggered_flight = _call(flight_api.trigger_flight, update_flight)
     print(f"   ✓ Flight triggered (State: {triggered_flight.state.value})")
     assert triggered_flight.state == RocketState.PREPARING
     
@@ -99,7 +107,7 @@ def integration_test():
         
         # Get current flight state using flight_api
         try:
-            flights = flight_api.get_flights(str(rocket.id))
+            flights = _call(flight_api.get_flights, str(rocket.id))
             if flights:
                 current_flight = next((f for f in flights if f.id == flight.id), None)
                 if current_flight:
@@ -128,7 +136,7 @@ def integration_test():
     # Final verification
     print("\n7. Verifying final state...")
     try:
-        final_flights = flight_api.get_flights(str(rocket.id))
+        final_flights = _call(flight_api.get_flights, str(rocket.id))
         if final_flights:
             final = next((f for f in final_flights if f.id == flight.id), None)
             if final:
@@ -1,7 +1,8 @@
 """Authentication endpoints."""
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from core.database import get_db
 from core.security import verify_password, get_password_hash, create_access_token
 from core.config import settings
@@ -12,10 +13,12 @@ router = APIRouter(prefix="/api/v1", tags=["auth"])
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = (
+        await db.execute(select(User).where(User.username == user_data.username))
+    ).scalar_one_or_none()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -29,16 +32,18 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         password_hash=hashed_password
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
 
 @router.post("/login", response_model=Token)
-async def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+async def login(credentials: LoginRequest, db: AsyncSession = Depends(get_db)):
     """Login and get JWT token."""
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user = (
+        await db.execute(select(User).where(User.username == credentials.username))
+    ).scalar_one_or_none()
     
     if not user or not verify_password(credentials.password, user.password_hash):
         raise HTTPException(
@@ -1,9 +1,13 @@
 """Rocket job management endpoints."""
-from typing import List, Optional
+import base64
+from datetime import datetime, timezone
+from typing import Optional, Tuple
 from uuid import UUID, uuid4
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy import delete, exists, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from core.database import get_db
 from api.dependencies import get_current_user
 from models.user import User
@@ -14,91 +18,140 @@ from schemas.rocket_job import (
     RocketCreate,
     RocketUpdate,
     RocketResponse,
+    RocketPage,
     RocketHistoryResponse,
     JobHistoryEntry
 )
 from services.airflow_service2 import airflow_service2
-from datetime import datetime
 
 router = APIRouter(prefix="/api/v1/job", tags=["jobs"])
 rocket_router = APIRouter(prefix="/api/v1/rocket", tags=["rockets"])
 flight_router = APIRouter(prefix="/api/v1/flight", tags=["flight"])
 
+# Rows coming out of the database are already valid, so list responses are
+# built with model_construct and serialized in one pass
+_ROCKET_RESPONSE_FIELDS = tuple(RocketResponse.model_fields)
+
+
+def _encode_cursor(rocket: Rocket) -> str:
+    """Encode a rocket's (created_at, id) sort key as an opaque cursor."""
+    raw = f"{rocket.created_at.isoformat()}|{rocket.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by _encode_cursor."""
+    try:
+        created_at, rocket_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(rocket_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
 
 @router.post("", response_model=RocketResponse, status_code=status.HTTP_201_CREATED)
 async def create_rocket(
     job_data: RocketCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create a new rocket."""
-    # Create new rocket
+    # Generate the id client-side so the rocket and its first history entry
+    # go out in one flush; created with RUNNING since the background
+    # process is started right after the commit
+    new_id = uuid4()
     new_job = Rocket(
+        id=new_id,
         state=RocketState.PREPARING,
         name=job_data.name,
         source='earth',
         destination='mars',
         location='earth',  # Start at source
         estimated_time=999999,
-        status=JobStatus.IDLE,
+        status=JobStatus.RUNNING,
+        expected_land_at=datetime.now(timezone.utc) + airflow_service2.operation_duration,
         user_id=current_user.id
     )
-    db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
-    
-    # Create initial history entry
     history_entry = JobHistory(
-        rocket_id=new_job.id,
+        rocket_id=new_id,
         state=RocketState.PREPARING,
         message=f"Job created: {new_job.source} -> {new_job.destination}"
     )
-    db.add(history_entry)
-    db.commit()
+    db.add_all([new_job, history_entry])
+    await db.commit()
     
     # Trigger rocket process to start state transitions
     airflow_service2.start_rocket_process(
         rocket_id=str(new_job.id),
         source=new_job.source,
-        destination=new_job.destination,
-        db=db
+        destination=new_job.destination
     )
     
-    db.refresh(new_job)
     return new_job
 
 
-@router.get("", response_model=List[RocketResponse])
+@router.get("", response_model=RocketPage)
 async def get_rockets(
     state: Optional[RocketState] = Query(None, description="Filter by rocket state"),
     status_filter: Optional[JobStatus] = Query(None, alias="status", description="Filter by job status"),
-    user_id: Optional[str] = Query(None, description="Filter by user ID"),
+    user_id: Optional[UUID] = Query(None, description="Filter by user ID"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of rockets to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all rockets with optional filters."""
-    query = db.query(Rocket)
-    
-    # Apply filters
+    """Get a page of rockets, newest first, with optional filters."""
+    conds = []
     if state:
-        query = query.filter(Rocket.state == state)
+        conds.append(Rocket.state == state)
     if status_filter:
-        query = query.filter(Rocket.status == status_filter)
+        conds.append(Rocket.status == status_filter)
     if user_id:
-        query = query.filter(Rocket.user_id == user_id)
+        conds.append(Rocket.user_id == user_id)
+    if cursor:
+        # Keyset pagination: seek past the last row of the previous page
+        conds.append(tuple_(Rocket.created_at, Rocket.id) < _decode_cursor(cursor))
+    
+    # Built in one shot so each filter combination maps to a single
+    # statement shape in SQLAlchemy's compiled cache; values stay bound.
+    # RocketResponse only renders columns; fail loudly if serialization ever
+    # touches an unloaded relationship instead of lazy loading per row
+    stmt = (
+        select(Rocket)
+        .options(raiseload("*"))
+        .where(*conds)
+        .order_by(Rocket.created_at.desc(), Rocket.id.desc())
+        .limit(limit + 1)
+    )
+    jobs = (await db.execute(stmt)).scalars().all()
+    
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = _encode_cursor(jobs[-1])
     
-    jobs = query.order_by(Rocket.created_at.desc()).all()
-    return jobs
+    page = RocketPage.model_construct(
+        items=[
+            RocketResponse.model_construct(
+                **{field: getattr(job, field) for field in _ROCKET_RESPONSE_FIELDS}
+            )
+            for job in jobs
+        ],
+        next_cursor=next_cursor
+    )
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
 @rocket_router.get("/{rocket_id}", response_model=RocketResponse)
 async def get_rocket(
-    rocket_id: str,
+    rocket_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get rocket by ID."""
-    job = db.query(Rocket).filter(Rocket.id == rocket_id).first()
+    job = await db.get(Rocket, rocket_id)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -109,58 +162,64 @@ async def get_rocket(
 
 @rocket_router.delete("/{rocket_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_rocket(
-    rocket_id: str,
+    rocket_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Delete rocket by ID."""
-    job = db.query(Rocket).filter(Rocket.id == rocket_id).first()
-    if not job:
+    # History rows go with it through ON DELETE CASCADE
+    deleted_id = await db.scalar(
+        delete(Rocket).where(Rocket.id == rocket_id).returning(Rocket.id)
+    )
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Rocket not found"
         )
+    await db.commit()
     
-    # Stop the rocket process if it's running
-    airflow_service2.stop_rocket_process(rocket_id)
+    # Stop the rocket's background task if it's running
+    await airflow_service2.stop_rocket_process(str(rocket_id))
     
-    db.delete(job)
-    db.commit()
     return None
 
 
 @router.patch("/{rocket_id}", response_model=RocketResponse)
 async def update_job(
-    rocket_id: str,
+    rocket_id: UUID,
     job_update: RocketUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update job details or state."""
-    job = db.query(Rocket).filter(Rocket.id == rocket_id).first()
+    update_data = job_update.model_dump(exclude_unset=True)
+    
+    # Apply the update and read back the row in one round-trip
+    job = (
+        await db.execute(
+            update(Rocket)
+            .where(Rocket.id == rocket_id)
+            .values(**update_data, updated_at=func.now())
+            .returning(Rocket)
+        )
+    ).scalar_one_or_none()
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job not found"
         )
     
-    # Update fields
-    update_data = job_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(job, field, value)
-    
     # Create history entry if state changed
     if "state" in update_data:
-        history_entry = JobHistory(
-            rocket_id=job.id,
-            state=update_data["state"],
-            message=f"State updated to {update_data['state']}"
+        await db.execute(
+            insert(JobHistory).values(
+                rocket_id=rocket_id,
+                state=update_data["state"],
+                message=f"State updated to {update_data['state']}"
+            )
         )
-        db.add(history_entry)
     
-    job.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(job)
+    await db.commit()
     
     return job
 
@@ -169,19 +228,28 @@ async def update_job(
 
 @flight_router.get("/history/{rocket_id}", response_model=RocketHistoryResponse)
 async def get_flight_history(
-    rocket_id: str,
+    rocket_id: UUID,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get the flight history for a given flightID."""
-    job = db.query(Rocket).filter(Rocket.id == rocket_id).first()
-    if not job:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Rocket not found"
+    history = (
+        await db.execute(
+            select(JobHistory)
+            .where(JobHistory.rocket_id == rocket_id)
+            .order_by(JobHistory.timestamp)
         )
+    ).scalars().all()
     
-    history = db.query(JobHistory).filter(JobHistory.rocket_id == rocket_id).order_by(JobHistory.timestamp).all()
+    # History rows reference their rocket, so only an empty result needs
+    # a separate existence check
+    if not history:
+        rocket_exists = await db.scalar(select(exists().where(Rocket.id == rocket_id)))
+        if not rocket_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Rocket not found"
+            )
     return RocketHistoryResponse(history=history)
 
 
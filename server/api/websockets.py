@@ -1,57 +1,216 @@
 """WebSocket endpoints for live job updates."""
-from typing import List, Optional
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+import asyncpg
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-from models.rocket_job import Rocket
+from sqlalchemy import make_url
+from core.config import settings
+from models.enums import JobStatus, RocketState
+from schemas.rocket_job import seconds_to_landing
 import uuid
 
 router = APIRouter(prefix="/api/v1/ws", tags=["websockets"])
 
 
+def _dumps(message: dict) -> str:
+    """Serialize a message with orjson, kept as a text frame for clients."""
+    return orjson.dumps(message).decode()
+
+
 class ConnectionManager:
     """Manages WebSocket connections."""
     
+    # How long queued job updates are held so bursts go out as one message
+    BATCH_WINDOW_SECONDS = 0.02
+    # Postgres channel the rocket_jobs trigger notifies on every committed update
+    NOTIFY_CHANNEL = "rocket_updates"
+    # Pause before re-opening a lost LISTEN connection
+    LISTEN_RETRY_SECONDS = 1.0
+    
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        self.user_connections: dict = {}  # Map user_id to list of connections
+        self.active_connections: Set[WebSocket] = set()
+        self.user_connections: Dict[uuid.UUID, Set[WebSocket]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._listen_task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Start listening for rocket updates and flushing them to clients.
+        
+        Every worker process listens on its own database connection, so
+        clients get an update no matter which process committed it.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._flush_task = asyncio.create_task(self._flush_updates())
+        self._listen_task = asyncio.create_task(self._listen_for_updates())
+    
+    async def stop(self):
+        """Stop listening for and flushing job updates."""
+        for task in (self._listen_task, self._flush_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._loop = self._queue = self._flush_task = self._listen_task = None
+    
+    def queue_update(self, message: dict, user_id: Optional[uuid.UUID] = None):
+        """Queue a job update for the next batched broadcast.
+        
+        Safe to call from other threads and event loops; the update is
+        handed to the loop the manager was started on.
+        """
+        loop, queue = self._loop, self._queue
+        if loop is None or queue is None:
+            return
+        item = (user_id, message)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            queue.put_nowait(item)
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+    
+    async def _flush_updates(self):
+        """Send queued job updates in batches, one message per audience."""
+        queue = self._queue
+        while True:
+            items = [await queue.get()]
+            await asyncio.sleep(self.BATCH_WINDOW_SECONDS)
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            
+            # Later updates for the same job replace earlier ones
+            batches: Dict[Optional[uuid.UUID], dict] = defaultdict(dict)
+            for user_id, message in items:
+                batches[user_id][message["job"]["id"]] = message
+            
+            for user_id, updates in batches.items():
+                updates = list(updates.values())
+                message = updates[0] if len(updates) == 1 else {"type": "batch", "updates": updates}
+                try:
+                    await self._deliver(_dumps(message), user_id)
+                except Exception as e:
+                    print(f"Error broadcasting job updates: {e}")
+    
+    async def _listen_for_updates(self):
+        """Queue a job update for every rocket row change Postgres notifies about.
+        
+        Uses a dedicated asyncpg connection outside the engine's pool, and
+        reconnects if it is lost.
+        """
+        dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _connection: lost.set())
+                await connection.add_listener(self.NOTIFY_CHANNEL, self._on_notify)
+                await lost.wait()
+            except Exception as e:
+                print(f"Error listening for rocket updates: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.LISTEN_RETRY_SECONDS)
+    
+    def _on_notify(self, connection, pid: int, channel: str, payload: str):
+        """Turn a rocket_jobs notification into a queued job update."""
+        try:
+            row = orjson.loads(payload)
+            # Enum columns hold member names; clients get the values
+            job_status = JobStatus[row["status"]]
+            expected_land_at = row.get("expected_land_at")
+            if expected_land_at is not None:
+                expected_land_at = datetime.fromisoformat(expected_land_at)
+            message = {
+                "type": "job_update",
+                "job": {
+                    "id": row["id"],
+                    "state": RocketState[row["state"]],
+                    "source": row["source"],
+                    "destination": row["destination"],
+                    "location": row["location"],
+                    "estimated_time": seconds_to_landing(
+                        expected_land_at, job_status, row["estimated_time"]
+                    ),
+                    "status": job_status,
+                    "updated_at": row["updated_at"]
+                }
+            }
+            self.queue_update(message, uuid.UUID(row["user_id"]))
+        except Exception as e:
+            print(f"Error handling rocket update notification: {e}")
     
     async def connect(self, websocket: WebSocket, user_id: Optional[uuid.UUID] = None):
         """Accept a WebSocket connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
         if user_id:
-            if user_id not in self.user_connections:
-                self.user_connections[user_id] = []
-            self.user_connections[user_id].append(websocket)
+            self.user_connections[user_id].add(websocket)
     
     def disconnect(self, websocket: WebSocket, user_id: Optional[uuid.UUID] = None):
         """Remove a WebSocket connection."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        if user_id and user_id in self.user_connections:
-            if websocket in self.user_connections[user_id]:
-                self.user_connections[user_id].remove(websocket)
+        self.active_connections.discard(websocket)
+        if user_id:
+            connections = self.user_connections.get(user_id)
+            if connections is not None:
+                connections.discard(websocket)
+                if not connections:
+                    del self.user_connections[user_id]
     
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """Send a message to a specific connection."""
-        await websocket.send_json(message)
+        await websocket.send_text(_dumps(message))
+    
+    async def _send_all(
+        self,
+        connections: Iterable[WebSocket],
+        payload: str,
+        user_id: Optional[uuid.UUID] = None
+    ):
+        """Send a pre-serialized payload to connections concurrently.
+        
+        Connections that fail to receive it are dropped.
+        """
+        targets = list(connections)
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in targets),
+            return_exceptions=True
+        )
+        for connection, result in zip(targets, results):
+            if isinstance(result, Exception):
+                print(f"Error sending to connection, dropping it: {result}")
+                self.disconnect(connection, user_id)
+    
+    async def _deliver(self, payload: str, user_id: Optional[uuid.UUID] = None):
+        """Send a pre-serialized payload to one user's connections, or to all."""
+        if user_id:
+            # Snapshot so sockets dropped mid-send don't mutate the set being iterated
+            connections = tuple(self.user_connections.get(user_id, ()))
+            if connections:
+                await self._send_all(connections, payload, user_id)
+        else:
+            await self._send_all(self.active_connections, payload)
     
     async def broadcast(self, message: dict):
         """Broadcast a message to all connected clients."""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"Error broadcasting to connection: {e}")
+        await self._deliver(_dumps(message))
     
     async def broadcast_to_user(self, message: dict, user_id: uuid.UUID):
         """Broadcast a message to all connections for a specific user."""
-        if user_id in self.user_connections:
-            for connection in self.user_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"Error sending to user connection: {e}")
-
+        await self._deliver(_dumps(message), user_id)
 
 manager = ConnectionManager()
 
@@ -95,27 +254,3 @@ async def websocket_jobs(
             )
     except WebSocketDisconnect:
         manager.disconnect(websocket, parsed_user_id)
-
-
-# Helper function to broadcast job updates (can be called from other parts of the app)
-async def broadcast_job_update(job: Rocket, user_id: Optional[uuid.UUID] = None):
-    """Broadcast a job update to connected clients."""
-    message = {
-        "type": "job_update",
-        "job": {
-            "id": str(job.id),
-            "state": job.state.value,
-            "source": job.source,
-            "destination": job.destination,
-            "location": job.location,
-            "estimated_time": job.estimated_time,
-            "status": job.status.value,
-            "updated_at": job.updated_at.isoformat()
-        }
-    }
-    
-    if user_id:
-        await manager.broadcast_to_user(message, user_id)
-    else:
-        await manager.broadcast(message)
-
@@ -1,18 +1,35 @@
 """Main FastAPI application."""
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from core.database import engine, Base
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from api import auth, jobs, websockets
+from core.database import async_engine
+from services.airflow_service import airflow_service
+from services.airflow_service2 import airflow_service2
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the WebSocket update flusher; stop rocket tasks and release shared clients and the DB pool on shutdown."""
+    await websockets.manager.start()
+    yield
+    await airflow_service2.aclose()
+    # After the rocket tasks, which still write while they cancel
+    await async_engine.dispose()
+    await websockets.manager.stop()
+    await airflow_service.aclose()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
     title="Vibe Rocket Flight API",
     description="API for managing rocket flight jobs",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -24,6 +41,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies such as the rocket list; WebSocket traffic is
+# not affected
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(jobs.router)
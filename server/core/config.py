@@ -11,6 +11,9 @@ class Settings:
 
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # Per-process pool; the total across workers must fit max_connections
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "40"))
 
     # JWT
     SECRET_KEY: str = os.getenv("SECRET_KEY")
@@ -22,5 +25,11 @@ class Settings:
     AIRFLOW_USERNAME: str = os.getenv("AIRFLOW_USERNAME")
     AIRFLOW_PASSWORD: str = os.getenv("AIRFLOW_PASSWORD")
 
+    # Uvicorn
+    # Each worker listens for job updates itself, so any number of workers
+    # can serve WebSocket clients.
+    UVICORN_WORKERS: int = int(os.getenv("UVICORN_WORKERS", "1"))
+    UVICORN_RELOAD: bool = os.getenv("UVICORN_RELOAD", "false").lower() == "true"
+
 
 settings = Settings()
@@ -1,11 +1,16 @@
 """Application entry point."""
 import uvicorn
-from app import app
+from core.config import settings
 
 if __name__ == "__main__":
+    # uvloop + httptools replace the stdlib asyncio loop and the pure-Python
+    # h11 parser; both ship with uvicorn[standard].
     uvicorn.run(
         "app:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        loop="uvloop",
+        http="httptools",
+        workers=settings.UVICORN_WORKERS,
+        reload=settings.UVICORN_RELOAD
     )
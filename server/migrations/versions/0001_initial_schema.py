@@ -0,0 +1,67 @@
+"""Initial schema, as previously created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ROCKET_STATES = ("PREPARING", "READY", "IN_FLIGHT", "LANDED", "RUD")
+JOB_STATUSES = ("IDLE", "RUNNING", "SUCCEEDED", "FAILED", "CANCELLED")
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "rocket_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("state", sa.Enum(*ROCKET_STATES, name="rocketstate"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("destination", sa.String(), nullable=False),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("estimated_time", sa.Integer(), nullable=False),
+        sa.Column("status", sa.Enum(*JOB_STATUSES, name="jobstatus"), nullable=False),
+        sa.Column("airflow_dag_run_id", sa.String(), nullable=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    op.create_table(
+        "job_history",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("rocket_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("rocket_jobs.id"), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column(
+            "state",
+            postgresql.ENUM(*ROCKET_STATES, name="rocketstate", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("message", sa.Text(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("job_history")
+    op.drop_table("rocket_jobs")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_table("users")
+    sa.Enum(name="jobstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="rocketstate").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,81 @@
+"""Rocket list indexes, server-side timestamps and cascading history deletes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        "rocket_jobs",
+        "created_at",
+        type_=sa.DateTime(timezone=True),
+        postgresql_using="created_at AT TIME ZONE 'UTC'",
+        server_default=sa.func.now(),
+    )
+    op.alter_column(
+        "rocket_jobs",
+        "updated_at",
+        type_=sa.DateTime(timezone=True),
+        postgresql_using="updated_at AT TIME ZONE 'UTC'",
+        server_default=sa.func.now(),
+    )
+
+    op.drop_constraint("job_history_rocket_id_fkey", "job_history", type_="foreignkey")
+    op.create_foreign_key(
+        "job_history_rocket_id_fkey",
+        "job_history",
+        "rocket_jobs",
+        ["rocket_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    # Build the indexes without locking writes on populated tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_rocket_user_created", "rocket_jobs", ["user_id", "created_at"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_rocket_state_status", "rocket_jobs", ["state", "status"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            "ix_jh_rocket_ts", "job_history", ["rocket_id", "timestamp"],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_jh_rocket_ts", table_name="job_history")
+    op.drop_index("ix_rocket_state_status", table_name="rocket_jobs")
+    op.drop_index("ix_rocket_user_created", table_name="rocket_jobs")
+
+    op.drop_constraint("job_history_rocket_id_fkey", "job_history", type_="foreignkey")
+    op.create_foreign_key(
+        "job_history_rocket_id_fkey", "job_history", "rocket_jobs", ["rocket_id"], ["id"]
+    )
+
+    op.alter_column(
+        "rocket_jobs",
+        "updated_at",
+        type_=sa.DateTime(),
+        postgresql_using="updated_at AT TIME ZONE 'UTC'",
+        server_default=None,
+    )
+    op.alter_column(
+        "rocket_jobs",
+        "created_at",
+        type_=sa.DateTime(),
+        postgresql_using="created_at AT TIME ZONE 'UTC'",
+        server_default=None,
+    )
@@ -0,0 +1,53 @@
+"""Notify listeners of committed rocket updates
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NOTIFY is delivered on commit, so listeners never see rolled-back
+    # updates. Only the columns clients receive are sent, which keeps the
+    # payload well under Postgres' 8000-byte limit.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_rocket_update() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('rocket_updates', json_build_object(
+                'id', NEW.id,
+                'user_id', NEW.user_id,
+                'state', NEW.state,
+                'source', NEW.source,
+                'destination', NEW.destination,
+                'location', NEW.location,
+                'estimated_time', NEW.estimated_time,
+                'status', NEW.status,
+                'updated_at', NEW.updated_at
+            )::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER rocket_jobs_notify_update
+        AFTER UPDATE ON rocket_jobs
+        FOR EACH ROW
+        WHEN (OLD.* IS DISTINCT FROM NEW.*)
+        EXECUTE FUNCTION notify_rocket_update()
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS rocket_jobs_notify_update ON rocket_jobs")
+    op.execute("DROP FUNCTION IF EXISTS notify_rocket_update()")
@@ -0,0 +1,51 @@
+"""Store when a rocket is expected to land
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def _replace_notify_function(extra_fields: str):
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION notify_rocket_update() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('rocket_updates', json_build_object(
+                'id', NEW.id,
+                'user_id', NEW.user_id,
+                'state', NEW.state,
+                'source', NEW.source,
+                'destination', NEW.destination,
+                'location', NEW.location,
+                'estimated_time', NEW.estimated_time,
+                'status', NEW.status,{extra_fields}
+                'updated_at', NEW.updated_at
+            )::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def upgrade():
+    # Nullable without a default, so adding it doesn't rewrite the table
+    op.add_column(
+        "rocket_jobs",
+        sa.Column("expected_land_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    # Listeners derive the countdown from it too
+    _replace_notify_function("\n                'expected_land_at', NEW.expected_land_at,")
+
+
+def downgrade():
+    _replace_notify_function("")
+    op.drop_column("rocket_jobs", "expected_land_at")
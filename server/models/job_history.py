@@ -1,7 +1,7 @@
 """JobHistory model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -12,9 +12,12 @@ class JobHistory(Base):
     """JobHistory model for tracking state transitions."""
     
     __tablename__ = "job_history"
+    __table_args__ = (
+        Index("ix_jh_rocket_ts", "rocket_id", "timestamp"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    rocket_id = Column(UUID(as_uuid=True), ForeignKey("rocket_jobs.id"), nullable=False)
+    rocket_id = Column(UUID(as_uuid=True), ForeignKey("rocket_jobs.id", ondelete="CASCADE"), nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     state = Column(SQLEnum(RocketState), nullable=False)
     message = Column(Text, nullable=True)
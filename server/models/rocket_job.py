@@ -1,7 +1,6 @@
 """Rocket model."""
 import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum as SQLEnum, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -12,6 +11,16 @@ class Rocket(Base):
     """Rocket model representing a rocket flight job."""
     
     __tablename__ = "rocket_jobs"
+    __table_args__ = (
+        # get_rockets filters on these and orders by created_at
+        Index("ix_rocket_user_created", "user_id", "created_at"),
+        Index("ix_rocket_state_status", "state", "status"),
+        # Keyset pagination order for the rocket list
+        Index("ix_rocket_created_id", "created_at", "id"),
+    )
+    # Fetch the server-generated timestamps with RETURNING on INSERT/UPDATE
+    # instead of expiring them
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     state = Column(SQLEnum(RocketState), nullable=False, default=RocketState.PREPARING)
@@ -20,14 +29,17 @@ class Rocket(Base):
     destination = Column(String, nullable=False)
     location = Column(String, nullable=True)
     estimated_time = Column(Integer, nullable=False)  # seconds
+    # While running, the countdown is derived from this instead of being
+    # rewritten every second
+    expected_land_at = Column(DateTime(timezone=True), nullable=True)
     status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.IDLE)
     airflow_dag_run_id = Column(String, nullable=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationships
     user = relationship("User", backref="jobs")
-    history = relationship("JobHistory", back_populates="job", cascade="all, delete-orphan")
+    history = relationship("JobHistory", back_populates="job", cascade="all, delete-orphan", passive_deletes=True)
 
 
@@ -4,6 +4,7 @@ from .rocket_job import (
     RocketCreate,
     RocketUpdate,
     RocketResponse,
+    RocketPage,
     RocketHistoryResponse
 )
 
@@ -16,6 +17,7 @@ __all__ = [
     "RocketCreate",
     "RocketUpdate",
     "RocketResponse",
+    "RocketPage",
     "RocketHistoryResponse",
 ]
 
@@ -1,11 +1,23 @@
 """Rocket schemas."""
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, field_serializer
 import uuid
 from models.enums import RocketState, JobStatus
 
 
+def seconds_to_landing(
+    expected_land_at: Optional[datetime],
+    status: JobStatus,
+    estimated_time: int
+) -> int:
+    """Seconds until landing: counted down from expected_land_at while the
+    rocket is running, otherwise the stored estimated_time."""
+    if status != JobStatus.RUNNING or expected_land_at is None:
+        return estimated_time
+    return max(0, int((expected_land_at - datetime.now(timezone.utc)).total_seconds()))
+
+
 class RocketCreate(BaseModel):
     """Rocket creation schema."""
     name: str
@@ -30,11 +42,22 @@ class RocketResponse(BaseModel):
     location: Optional[str]
     estimated_time: int
     status: JobStatus
+    expected_land_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     
     class Config:
         from_attributes = True
+    
+    @field_serializer("estimated_time")
+    def _serialize_estimated_time(self, estimated_time: int) -> int:
+        return seconds_to_landing(self.expected_land_at, self.status, estimated_time)
+
+
+class RocketPage(BaseModel):
+    """Page of rockets with the cursor for the next page."""
+    items: List[RocketResponse]
+    next_cursor: Optional[str] = None
 
 
 class JobHistoryEntry(BaseModel):
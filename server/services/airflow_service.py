@@ -1,6 +1,8 @@
 """Airflow integration service."""
-import requests
-from typing import Optional, Dict, Any
+import asyncio
+import httpx
+from cachetools import TTLCache
+from typing import Optional, Dict, Any, List
 from core.config import settings
 import uuid
 
@@ -8,13 +10,57 @@ import uuid
 class AirflowService:
     """Service for interacting with Airflow API."""
     
+    # Gateway errors worth retrying on idempotent GETs, with exponential backoff
+    RETRY_STATUSES = frozenset({502, 503, 504})
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_SECONDS = 0.2
+    # Status polls repeat faster than runs change; answer repeats from cache
+    STATUS_CACHE_TTL_SECONDS = 0.5
+    XCOM_PAGE_SIZE = 100
+    # Fail fast when Airflow is unreachable; give slow responses longer
+    TIMEOUT = httpx.Timeout(10.0, connect=3.05)
+    
     def __init__(self):
         self.base_url = settings.AIRFLOW_BASE_URL
+        # Without a base URL there is no Airflow to talk to; every lookup
+        # answers None straight away instead of failing over the network
+        self.enabled = bool(self.base_url)
         self.auth = None
         if settings.AIRFLOW_USERNAME and settings.AIRFLOW_PASSWORD:
             self.auth = (settings.AIRFLOW_USERNAME, settings.AIRFLOW_PASSWORD)
+        
+        # One shared keep-alive pool for every Airflow call; the transport
+        # also retries failed connection attempts
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url or "",
+            auth=self.auth,
+            timeout=self.TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                retries=self.MAX_RETRIES,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=16)
+            )
+        )
+        
+        # Keyed on (dag_id, dag_run_id); only touched from the event loop
+        self._status_cache = TTLCache(maxsize=4096, ttl=self.STATUS_CACHE_TTL_SECONDS)
+        self._job_info_cache = TTLCache(maxsize=4096, ttl=self.STATUS_CACHE_TTL_SECONDS)
+        # Task ids are part of the DAG definition, so look up which of a
+        # DAG's tasks publish rocket info once and read only their XComs
+        self._xcom_task_ids: Dict[str, List[str]] = {}
+    
+    async def aclose(self):
+        """Close the async HTTP client."""
+        await self.client.aclose()
+    
+    async def _get(self, path: str, params: Optional[dict] = None) -> httpx.Response:
+        """GET an Airflow API path, retrying transient gateway errors."""
+        for attempt in range(self.MAX_RETRIES + 1):
+            response = await self.client.get(path, params=params)
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_RETRIES:
+                return response
+            await asyncio.sleep(self.RETRY_BACKOFF_SECONDS * 2 ** attempt)
     
-    def trigger_dag(self, dag_id: str, rocket_id: uuid.UUID, conf: Optional[dict] = None) -> Optional[str]:
+    async def trigger_dag(self, dag_id: str, rocket_id: uuid.UUID, conf: Optional[dict] = None) -> Optional[str]:
         """Trigger an Airflow DAG run for a job.
         
         Args:
@@ -25,29 +71,30 @@ class AirflowService:
         Returns:
             DAG run ID if successful, None otherwise
         """
-        url = f"{self.base_url}/api/v1/dags/{dag_id}/dagRuns"
-        
+        if not self.enabled:
+            return None
+        dag_run_id = f"rocket_job_{rocket_id}"
         payload = {
-            "dag_run_id": f"rocket_job_{rocket_id}",
+            "dag_run_id": dag_run_id,
             "conf": conf or {}
         }
         
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                auth=self.auth,
-                headers={"Content-Type": "application/json"}
-            )
+            response = await self.client.post(f"/api/v1/dags/{dag_id}/dagRuns", json=payload)
+            # A new run under this id makes any cached answer stale
+            self._status_cache.pop((dag_id, dag_run_id), None)
+            self._job_info_cache.pop((dag_id, dag_run_id), None)
             response.raise_for_status()
             data = response.json()
             return data.get("dag_run_id")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             # Log error in production
             print(f"Error triggering Airflow DAG: {e}")
+            # The DAG may have been redeployed with different tasks
+            self._xcom_task_ids.pop(dag_id, None)
             return None
     
-    def get_dag_run_status(self, dag_id: str, dag_run_id: str) -> Optional[str]:
+    async def get_dag_run_status(self, dag_id: str, dag_run_id: str) -> Optional[str]:
         """Get the status of an Airflow DAG run.
         
         Args:
@@ -57,18 +104,27 @@ class AirflowService:
         Returns:
             Status string if successful, None otherwise
         """
-        url = f"{self.base_url}/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}"
-        
+        if not self.enabled:
+            return None
+        key = (dag_id, dag_run_id)
+        if key in self._status_cache:
+            return self._status_cache[key]
+        status = await self._fetch_dag_run_status(dag_id, dag_run_id)
+        self._status_cache[key] = status
+        return status
+    
+    async def _fetch_dag_run_status(self, dag_id: str, dag_run_id: str) -> Optional[str]:
+        """Fetch the status of an Airflow DAG run, bypassing the cache."""
         try:
-            response = requests.get(url, auth=self.auth)
+            response = await self._get(f"/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}")
             response.raise_for_status()
             data = response.json()
             return data.get("state")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error getting DAG run status: {e}")
             return None
     
-    def get_job_info(self, dag_id: str, dag_run_id: str) -> Optional[Dict[str, Any]]:
+    async def get_job_info(self, dag_id: str, dag_run_id: str) -> Optional[Dict[str, Any]]:
         """Get rocket job information including state, estimated_time, and location.
         
         This method queries the Airflow pod/DAG run to get relevant information about
@@ -81,43 +137,91 @@ class AirflowService:
         Returns:
             Dictionary with {state, estimated_time, location} if successful, None otherwise
         """
-        # Try to get task instance information from Airflow
+        if not self.enabled:
+            return None
+        key = (dag_id, dag_run_id)
+        if key in self._job_info_cache:
+            return self._job_info_cache[key]
+        job_info = await self._fetch_job_info(dag_id, dag_run_id)
+        self._job_info_cache[key] = job_info
+        return job_info
+    
+    @staticmethod
+    def _is_rocket_task(task_id: str) -> bool:
+        """Whether a task id looks like one that publishes rocket info."""
+        task_id = task_id.lower()
+        return "rocket" in task_id or "status" in task_id
+    
+    async def _rocket_task_ids(self, dag_id: str) -> Optional[List[str]]:
+        """Ids of the DAG's tasks that publish rocket info, or None if the
+        task list can't be fetched."""
+        if dag_id in self._xcom_task_ids:
+            return self._xcom_task_ids[dag_id]
+        response = await self._get(f"/api/v1/dags/{dag_id}/tasks")
+        if response.status_code != 200:
+            return None
+        task_ids = [
+            task["task_id"] for task in response.json().get("tasks", [])
+            if self._is_rocket_task(task.get("task_id", ""))
+        ]
+        self._xcom_task_ids[dag_id] = task_ids
+        return task_ids
+    
+    async def _list_xcom_entries(self, path: str) -> List[Dict[str, Any]]:
+        """Collect every page of an XCom listing; an error response ends the listing."""
+        entries = []
+        offset = 0
+        while True:
+            response = await self._get(
+                path,
+                params={"limit": self.XCOM_PAGE_SIZE, "offset": offset}
+            )
+            if response.status_code != 200:
+                break
+            page = response.json().get("xcom_entries", [])
+            entries.extend(page)
+            offset += len(page)
+            if len(page) < self.XCOM_PAGE_SIZE:
+                break
+        return entries
+    
+    async def _fetch_job_info(self, dag_id: str, dag_run_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch rocket job information from Airflow, bypassing the cache."""
+        # Try to get job info from the XComs of the DAG run's tasks
         # The exact endpoint may vary based on your Airflow setup
         # This assumes the DAG has a task that returns this information
-        url = f"{self.base_url}/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances"
+        dag_run_path = f"/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}"
         
         try:
-            response = requests.get(url, auth=self.auth)
-            response.raise_for_status()
-            task_instances = response.json()
+            task_ids = await self._rocket_task_ids(dag_id)
+            if task_ids is None:
+                # "~" lists the XComs (Airflow's cross-communication mechanism)
+                # of every task instance in the run
+                xcom_entries = await self._list_xcom_entries(
+                    f"{dag_run_path}/taskInstances/~/xcomEntries"
+                )
+            else:
+                pages = await asyncio.gather(*(
+                    self._list_xcom_entries(f"{dag_run_path}/taskInstances/{task_id}/xcomEntries")
+                    for task_id in task_ids
+                ))
+                xcom_entries = [entry for page in pages for entry in page]
             
-            # Look for a task that returns job info (e.g., a task named "get_rocket_status" or similar)
+            # Look for job info from a task like "get_rocket_status"
             # This is a placeholder - adjust based on your actual Airflow DAG structure
-            for task_instance in task_instances.get("task_instances", []):
-                task_id = task_instance.get("task_id", "")
-                
-                # If there's a specific task that returns rocket info, query it
-                # For now, we'll try to get info from task logs or XComs
-                if "rocket" in task_id.lower() or "status" in task_id.lower():
-                    # Try to get XCom value (Airflow's cross-communication mechanism)
-                    xcom_url = f"{self.base_url}/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}/taskInstances/{task_id}/xcomEntries"
-                    xcom_response = requests.get(xcom_url, auth=self.auth)
-                    
-                    if xcom_response.status_code == 200:
-                        xcom_data = xcom_response.json()
-                        # Look for job info in XCom entries
-                        for entry in xcom_data.get("xcom_entries", []):
-                            value = entry.get("value")
-                            if isinstance(value, dict) and "state" in value:
-                                return {
-                                    "state": value.get("state"),
-                                    "estimated_time": value.get("estimated_time", 0),
-                                    "location": value.get("location", "unknown")
-                                }
+            for entry in xcom_entries:
+                if not self._is_rocket_task(entry.get("task_id", "")):
+                    continue
+                value = entry.get("value")
+                if isinstance(value, dict) and "state" in value:
+                    return {
+                        "state": value.get("state"),
+                        "estimated_time": value.get("estimated_time", 0),
+                        "location": value.get("location", "unknown")
+                    }
             
             # Fallback: Try to get info from DAG run conf
-            dag_run_url = f"{self.base_url}/api/v1/dags/{dag_id}/dagRuns/{dag_run_id}"
-            dag_run_response = requests.get(dag_run_url, auth=self.auth)
+            dag_run_response = await self._get(dag_run_path)
             
             if dag_run_response.status_code == 200:
                 dag_run_data = dag_run_response.json()
@@ -133,7 +237,7 @@ class AirflowService:
             
             return None
             
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Error getting job info from Airflow: {e}")
             return None
 
@@ -1,24 +1,33 @@
-"""Process-based rocket state transition service."""
-from typing import Optional, Dict, Any
+"""Asyncio-based rocket state transition service."""
+from typing import Optional, Dict, Any, List
 import uuid
-import threading
-import time
 import asyncio
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.enums import RocketState, JobStatus
 from models.rocket_job import Rocket
 from models.job_history import JobHistory
-from core.database import SessionLocal
-from core.config import settings
-from api.websockets import broadcast_job_update
+from core.database import AsyncSessionLocal
 
 
 class RocketProcessManager:
-    """Manages background processes for rocket state transitions."""
+    """Manages background tasks for rocket state transitions."""
+    
+    # Per-state location and history message, formatted once per flight
+    _STATE_LOCATION_TEMPLATES = {
+        RocketState.PREPARING: "{src}",
+        RocketState.READY: "{src}",
+        RocketState.IN_FLIGHT: "en route from {src} to {dst}",
+        RocketState.LANDED: "{dst}",
+    }
+    _STATE_MSG_TEMPLATES = {
+        RocketState.PREPARING: "Rocket preparing at {src}",
+        RocketState.READY: "Rocket ready for launch at {src}",
+        RocketState.IN_FLIGHT: "Rocket launched, en route to {dst}",
+        RocketState.LANDED: "Rocket landed at {dst}",
+    }
     
     def __init__(self, operation_duration_seconds: int = 30):
         """Initialize the rocket process manager.
@@ -26,8 +35,7 @@ class RocketProcessManager:
         Args:
             operation_duration_seconds: Total duration for a rocket flight (default: 30 seconds)
         """
-        self._processes: Dict[str, threading.Thread] = {}
-        self._process_stop_flags: Dict[str, threading.Event] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
         self.operation_duration = timedelta(seconds=operation_duration_seconds)
         
         # State progression timing (as percentage of total operation)
@@ -38,270 +46,239 @@ class RocketProcessManager:
             RocketState.LANDED: (0.9, 1.0),         # 90-100% of operation
         }
         
-        # Create a separate engine for background threads
-        self.engine = create_engine(
-            settings.DATABASE_URL,
-            pool_pre_ping=True,
-            echo=False
+        # Seconds into the flight at which each state begins, in order
+        total_duration_seconds = self.operation_duration.total_seconds()
+        self._state_offsets = sorted(
+            (
+                (state, total_duration_seconds * start_pct)
+                for state, (start_pct, _) in self._state_timings.items()
+            ),
+            key=lambda entry: entry[1]
+        )
+    
+    async def aclose(self):
+        """Cancel every running rocket task."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+    
+    async def _commit_state(
+        self,
+        db: AsyncSession,
+        rocket_id: str,
+        state: RocketState,
+        location: str,
+        estimated_time: int,
+        status: JobStatus,
+        message: Optional[str],
+        pending_history: List[JobHistory]
+    ):
+        """Write one state transition and queue its history entry.
+        
+        WebSocket clients hear about the change from the rocket_jobs update
+        trigger once it commits.
+        
+        Args:
+            db: The worker's database session
+            rocket_id: The rocket UUID as string
+            state: The state the rocket enters
+            location: The rocket's location in that state
+            estimated_time: Seconds remaining until landing
+            status: The job status to record
+            message: History message, or None to skip the history entry
+            pending_history: History entries to insert when the flight ends
+        """
+        stmt = (
+            update(Rocket)
+            .where(Rocket.id == uuid.UUID(rocket_id))
+            .values(
+                state=state,
+                location=location,
+                estimated_time=estimated_time,
+                status=status,
+                updated_at=func.now()
+            )
+            .returning(Rocket)
         )
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        try:
+            async with db.begin():
+                rocket = (await db.execute(stmt)).scalar_one_or_none()
+        except Exception as e:
+            print(f"Error updating rocket {rocket_id}: {e}")
+            return
+        if not rocket:
+            return
+        
+        # Create history entry for state change, stamped now rather than
+        # when the batch is flushed
+        if message is not None:
+            pending_history.append(JobHistory(
+                rocket_id=rocket.id,
+                timestamp=datetime.utcnow(),
+                state=state,
+                message=message
+            ))
     
-    def _get_db_session(self) -> Session:
-        """Get a database session for the background thread."""
-        return self.SessionLocal()
+    async def _flush_history(
+        self,
+        db: AsyncSession,
+        rocket_id: str,
+        pending_history: List[JobHistory]
+    ):
+        """Insert a flight's queued history entries in one transaction.
+        
+        Entries for a rocket that was deleted mid-flight are dropped.
+        
+        Args:
+            db: The worker's database session
+            rocket_id: The rocket UUID as string
+            pending_history: History entries queued during the flight
+        """
+        if not pending_history:
+            return
+        try:
+            async with db.begin():
+                # Key-share lock the rocket so it can't be deleted between
+                # this check and the insert
+                rocket_exists = await db.scalar(
+                    select(Rocket.id)
+                    .where(Rocket.id == uuid.UUID(rocket_id))
+                    .with_for_update(key_share=True)
+                )
+                if rocket_exists is not None:
+                    db.add_all(pending_history)
+        except Exception as e:
+            print(f"Error saving history for rocket {rocket_id}: {e}")
     
-    def _rocket_state_transition_worker(
+    async def _rocket_state_transition_worker(
         self,
         rocket_id: str,
         source: str,
-        destination: str,
-        stop_event: threading.Event
+        destination: str
     ):
-        """Background worker that transitions rocket states.
+        """Background task that transitions rocket states.
+        
+        The task sleeps until the next state boundary instead of polling,
+        so it writes once per state and once more when the flight completes.
+        Cancelling the task stops the flight.
         
         Args:
             rocket_id: The rocket UUID as string
             source: Flight origin
             destination: Flight destination
-            stop_event: Event to signal when to stop the process
         """
-        # Create a new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        loop = asyncio.get_running_loop()
+        start_time = loop.time()
+        end_time = start_time + self.operation_duration.total_seconds()
         
-        start_time = datetime.utcnow()
-        end_time = start_time + self.operation_duration
-        total_duration_seconds = self.operation_duration.total_seconds()
-        
-        # Update interval (every second)
-        update_interval = 1.0
+        locations = {
+            state: template.format(src=source, dst=destination)
+            for state, template in self._STATE_LOCATION_TEMPLATES.items()
+        }
+        state_messages = {
+            state: template.format(src=source, dst=destination)
+            for state, template in self._STATE_MSG_TEMPLATES.items()
+        }
         
-        last_state = None
+        # History is only read after the fact, so it is written in one batch
+        # when the flight ends (or is cancelled) instead of once per state
+        pending_history: List[JobHistory] = []
         
-        while not stop_event.is_set():
-            now = datetime.utcnow()
-            
-            # Check if we've exceeded the end time
-            if now >= end_time:
-                # Final state: LANDED
-                db = self._get_db_session()
-                try:
-                    rocket = db.query(Rocket).filter(Rocket.id == rocket_id).first()
-                    if rocket:
-                        if rocket.state != RocketState.LANDED:
-                            rocket.state = RocketState.LANDED
-                            rocket.location = destination
-                            rocket.estimated_time = 0
-                            rocket.status = JobStatus.SUCCEEDED
-                            rocket.updated_at = now
-                            
-                            # Create history entry
-                            history_entry = JobHistory(
-                                rocket_id=rocket.id,
-                                state=RocketState.LANDED,
-                                message=f"Rocket landed at {destination}"
-                            )
-                            db.add(history_entry)
-                            db.commit()
-                            
-                            # Broadcast update
-                            db.refresh(rocket)
-                            try:
-                                loop.run_until_complete(broadcast_job_update(rocket, rocket.user_id))
-                            except Exception as e:
-                                print(f"Error broadcasting update: {e}")
-                        
-                        db.close()
-                        break
-                except Exception as e:
-                    print(f"Error updating rocket {rocket_id}: {e}")
-                    db.rollback()
-                    db.close()
-                finally:
-                    if db:
-                        db.close()
-                break
-            
-            # Calculate progress
-            elapsed = (now - start_time).total_seconds()
-            progress = elapsed / total_duration_seconds
-            
-            # Determine current state based on progress
-            current_state = RocketState.PREPARING
-            for state, (start_pct, end_pct) in self._state_timings.items():
-                if start_pct <= progress < end_pct:
-                    current_state = state
-                    break
-            if progress >= 1.0:
-                current_state = RocketState.LANDED
-            
-            # Calculate location
-            if current_state == RocketState.PREPARING or current_state == RocketState.READY:
-                location = source
-            elif current_state == RocketState.IN_FLIGHT:
-                location = f"en route from {source} to {destination}"
-            elif current_state == RocketState.LANDED:
-                location = destination
-            else:
-                location = source
-            
-            # Calculate remaining estimated time
-            estimated_time = max(0, int((end_time - now).total_seconds()))
-            
-            # Update database if state changed
-            if current_state != last_state:
-                db = self._get_db_session()
+        try:
+            # One session for the whole flight; each write is its own short transaction
+            async with AsyncSessionLocal() as db:
                 try:
-                    rocket = db.query(Rocket).filter(Rocket.id == rocket_id).first()
-                    if rocket:
-                        rocket.state = current_state
-                        rocket.location = location
-                        rocket.estimated_time = estimated_time
-                        rocket.status = JobStatus.RUNNING
-                        rocket.updated_at = now
-                        
-                        # Create history entry for state change
-                        state_messages = {
-                            RocketState.PREPARING: f"Rocket preparing at {source}",
-                            RocketState.READY: f"Rocket ready for launch at {source}",
-                            RocketState.IN_FLIGHT: f"Rocket launched, en route to {destination}",
-                            RocketState.LANDED: f"Rocket landed at {destination}"
-                        }
-                        message = state_messages.get(current_state, f"State changed to {current_state.value}")
-                        
-                        history_entry = JobHistory(
-                            rocket_id=rocket.id,
-                            state=current_state,
-                            message=message
+                    for state, offset in self._state_offsets:
+                        await asyncio.sleep(max(0.0, start_time + offset - loop.time()))
+                        await self._commit_state(
+                            db,
+                            rocket_id,
+                            state,
+                            location=locations[state],
+                            estimated_time=max(0, int(end_time - loop.time())),
+                            status=JobStatus.RUNNING,
+                            message=state_messages[state],
+                            pending_history=pending_history
                         )
-                        db.add(history_entry)
-                        db.commit()
-                        
-                        # Broadcast update
-                        db.refresh(rocket)
-                        try:
-                            loop.run_until_complete(broadcast_job_update(rocket, rocket.user_id))
-                        except Exception as e:
-                            print(f"Error broadcasting update: {e}")
-                        
-                        last_state = current_state
-                except Exception as e:
-                    print(f"Error updating rocket {rocket_id}: {e}")
-                    db.rollback()
-                finally:
-                    db.close()
-            else:
-                # Update estimated_time and location even if state hasn't changed
-                db = self._get_db_session()
-                try:
-                    rocket = db.query(Rocket).filter(Rocket.id == rocket_id).first()
-                    if rocket:
-                        rocket.location = location
-                        rocket.estimated_time = estimated_time
-                        rocket.updated_at = now
-                        db.commit()
-                except Exception as e:
-                    print(f"Error updating rocket {rocket_id}: {e}")
-                    db.rollback()
+                    
+                    # Flight complete: the rocket has been LANDED since the last
+                    # boundary, so only the status and countdown change
+                    await asyncio.sleep(max(0.0, end_time - loop.time()))
+                    await self._commit_state(
+                        db,
+                        rocket_id,
+                        RocketState.LANDED,
+                        location=destination,
+                        estimated_time=0,
+                        status=JobStatus.SUCCEEDED,
+                        message=None,
+                        pending_history=pending_history
+                    )
                 finally:
-                    db.close()
-            
-            # Sleep until next update
-            time.sleep(update_interval)
-        
-        # Clean up
-        loop.close()
-        if rocket_id in self._processes:
-            del self._processes[rocket_id]
-        if rocket_id in self._process_stop_flags:
-            del self._process_stop_flags[rocket_id]
+                    await self._flush_history(db, rocket_id, pending_history)
+        finally:
+            # Clean up, unless a newer task already replaced this one
+            if self._tasks.get(rocket_id) is asyncio.current_task():
+                del self._tasks[rocket_id]
     
     def start_rocket_process(
         self,
         rocket_id: str,
         source: str,
-        destination: str,
-        db: Optional[Session] = None
+        destination: str
     ):
-        """Start a background process to transition rocket states.
+        """Start a background task to transition rocket states.
+        
+        Must be called from the application's event loop.
         
         Args:
             rocket_id: The rocket UUID as string
             source: Flight origin
             destination: Flight destination
-            db: Optional database session (for initial status update)
         """
-        # Stop any existing process for this rocket
-        if rocket_id in self._processes:
-            self.stop_rocket_process(rocket_id)
+        # Stop any existing task for this rocket
+        existing = self._tasks.pop(rocket_id, None)
+        if existing is not None:
+            existing.cancel()
         
-        # Update initial status in database
-        if db:
-            try:
-                rocket = db.query(Rocket).filter(Rocket.id == rocket_id).first()
-                if rocket:
-                    rocket.status = JobStatus.RUNNING
-                    db.commit()
-            except Exception as e:
-                print(f"Error updating rocket status: {e}")
-                db.rollback()
-        
-        # Create stop event
-        stop_event = threading.Event()
-        self._process_stop_flags[rocket_id] = stop_event
-        
-        # Create and start thread
-        thread = threading.Thread(
-            target=self._rocket_state_transition_worker,
-            args=(rocket_id, source, destination, stop_event),
-            daemon=True
+        self._tasks[rocket_id] = asyncio.create_task(
+            self._rocket_state_transition_worker(rocket_id, source, destination)
         )
-        thread.start()
-        self._processes[rocket_id] = thread
     
-    def stop_rocket_process(self, rocket_id: str):
-        """Stop the background process for a rocket.
+    async def stop_rocket_process(self, rocket_id: str):
+        """Stop the background task for a rocket.
         
         Args:
             rocket_id: The rocket UUID as string
         """
-        if rocket_id in self._process_stop_flags:
-            self._process_stop_flags[rocket_id].set()
-        
-        if rocket_id in self._processes:
-            thread = self._processes[rocket_id]
-            thread.join(timeout=2.0)  # Wait up to 2 seconds for thread to finish
+        task = self._tasks.pop(rocket_id, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
         
         # Update rocket status to cancelled if still running
-        db = self._get_db_session()
-        try:
-            rocket = db.query(Rocket).filter(Rocket.id == rocket_id).first()
-            if rocket and rocket.status == JobStatus.RUNNING:
-                rocket.status = JobStatus.CANCELLED
-                rocket.updated_at = datetime.utcnow()
-                
-                history_entry = JobHistory(
-                    rocket_id=rocket.id,
-                    state=rocket.state,
-                    message="Rocket process cancelled"
-                )
-                db.add(history_entry)
-                db.commit()
-                
-                db.refresh(rocket)
-                try:
-                    # Create a new event loop for this operation
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    loop.run_until_complete(broadcast_job_update(rocket, rocket.user_id))
-                    loop.close()
-                except Exception as e:
-                    print(f"Error broadcasting update: {e}")
-        except Exception as e:
-            print(f"Error cancelling rocket {rocket_id}: {e}")
-            db.rollback()
-        finally:
-            db.close()
+        stmt = (
+            update(Rocket)
+            .where(Rocket.id == uuid.UUID(rocket_id), Rocket.status == JobStatus.RUNNING)
+            .values(status=JobStatus.CANCELLED, updated_at=func.now())
+            .returning(Rocket)
+        )
+        async with AsyncSessionLocal() as db:
+            try:
+                rocket = (await db.execute(stmt)).scalar_one_or_none()
+                if rocket:
+                    history_entry = JobHistory(
+                        rocket_id=rocket.id,
+                        state=rocket.state,
+                        message="Rocket process cancelled"
+                    )
+                    db.add(history_entry)
+                    await db.commit()
+            except Exception as e:
+                print(f"Error cancelling rocket {rocket_id}: {e}")
+                await db.rollback()
     
     def get_rocket_process_status(self, rocket_id: str) -> bool:
         """Check if a rocket process is running.
@@ -312,11 +289,8 @@ class RocketProcessManager:
         Returns:
             True if process is running, False otherwise
         """
-        if rocket_id not in self._processes:
-            return False
-        
-        thread = self._processes[rocket_id]
-        return thread.is_alive()
+        task = self._tasks.get(rocket_id)
+        return task is not None and not task.done()
 
 
 # Module-level instance for convenience
@@ -1,6 +1,6 @@
 from core.config import settings
 
-from passlib.context import CryptContext
+from core.security import pwd_context
 
 if __name__ == "__main__":
     # print(settings.DATABASE_URL)
@@ -8,6 +8,5 @@ if __name__ == "__main__":
     # print(settings.ALGORITHM)
     # print(settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     hass7 = pwd_context.hash("test")
     print(hass7)
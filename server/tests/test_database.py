@@ -0,0 +1,28 @@
+"""Tests for building the async engine URL from DATABASE_URL."""
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.database import asyncpg_url
+
+
+def test_sslmode_is_passed_as_ssl_not_as_a_connect_argument():
+    url, sslmode = asyncpg_url(
+        "postgresql://u:p@db.example.com/vibe?sslmode=require&application_name=vibe"
+    )
+
+    assert sslmode == "require"
+    assert url.drivername == "postgresql+asyncpg"
+    assert "sslmode" not in url.query
+    assert url.query["application_name"] == "vibe"
+    assert url.query["prepared_statement_cache_size"] == "256"
+
+    engine = create_async_engine(url, connect_args={"ssl": sslmode})
+    _, connect_kwargs = engine.dialect.create_connect_args(url)
+    assert "sslmode" not in connect_kwargs
+    assert connect_kwargs["application_name"] == "vibe"
+
+
+def test_url_without_sslmode():
+    url, sslmode = asyncpg_url("postgresql://u:p@localhost/vibe")
+
+    assert sslmode is None
+    assert dict(url.query) == {"prepared_statement_cache_size": "256"}
@@ -0,0 +1,100 @@
+"""Tests for the rocket state transition tasks."""
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import models  # noqa: F401  (registers the tables on Base.metadata)
+import services.airflow_service2 as airflow_service2
+from core.database import Base
+from models.enums import JobStatus, RocketState
+from models.job_history import JobHistory
+from models.rocket_job import Rocket
+from models.user import User
+from services.airflow_service2 import RocketProcessManager
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """Point the rocket manager at a throwaway SQLite database that enforces foreign keys."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'rockets.db'}")
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
+    async def create_schema():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_schema())
+    factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    monkeypatch.setattr(airflow_service2, "AsyncSessionLocal", factory)
+    yield factory
+    asyncio.run(engine.dispose())
+
+
+async def _create_running_rocket(factory) -> uuid.UUID:
+    rocket_id = uuid.uuid4()
+    async with factory() as db:
+        user = User(id=uuid.uuid4(), username=f"user-{rocket_id}", password_hash="x")
+        db.add(user)
+        await db.flush()
+        db.add(Rocket(
+            id=rocket_id,
+            state=RocketState.PREPARING,
+            name="test",
+            source="earth",
+            destination="mars",
+            location="earth",
+            estimated_time=1,
+            status=JobStatus.RUNNING,
+            user_id=user.id
+        ))
+        await db.commit()
+    return rocket_id
+
+
+async def _history_count(factory) -> int:
+    async with factory() as db:
+        return await db.scalar(select(func.count()).select_from(JobHistory))
+
+
+def test_completed_flight_saves_its_history(session_factory):
+    async def scenario():
+        manager = RocketProcessManager(operation_duration_seconds=1)
+        rocket_id = await _create_running_rocket(session_factory)
+        manager.start_rocket_process(str(rocket_id), "earth", "mars")
+        await asyncio.sleep(1.3)
+
+        assert not manager.get_rocket_process_status(str(rocket_id))
+        async with session_factory() as db:
+            rocket = await db.get(Rocket, rocket_id)
+        assert rocket.state == RocketState.LANDED
+        assert rocket.status == JobStatus.SUCCEEDED
+        return await _history_count(session_factory)
+
+    assert asyncio.run(scenario()) == 4
+
+
+def test_deleting_running_rocket_drops_its_queued_history(session_factory, capsys):
+    async def scenario():
+        manager = RocketProcessManager(operation_duration_seconds=1)
+        rocket_id = await _create_running_rocket(session_factory)
+        manager.start_rocket_process(str(rocket_id), "earth", "mars")
+        # Past PREPARING and READY, so history entries are queued
+        await asyncio.sleep(0.3)
+
+        # Same order as the DELETE endpoint: remove the row, then stop the task
+        async with session_factory() as db:
+            await db.execute(delete(Rocket).where(Rocket.id == rocket_id))
+            await db.commit()
+        await manager.stop_rocket_process(str(rocket_id))
+
+        assert not manager.get_rocket_process_status(str(rocket_id))
+        return await _history_count(session_factory)
+
+    assert asyncio.run(scenario()) == 0
+    assert "Error" not in capsys.readouterr().out